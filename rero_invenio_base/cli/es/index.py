@@ -17,12 +17,15 @@
 
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from pprint import pformat
-from time import sleep
 
 import click
 from elasticsearch_dsl import Index
 from invenio_search import current_search, current_search_client
+from invenio_search.utils import build_alias_name, build_index_name
 
 try:
     from invenio_search.cli import es_version_check
@@ -30,7 +33,10 @@ except ImportError:
     from invenio_search.cli import search_version_check as es_version_check
 
 from invenio_search.cli import with_appcontext
-from jsonpatch import make_patch
+
+from .mappings import index_changes, live_indices, load_mapping, template_changes
+from .progress import TaskProgress
+from .waiter import TaskWaiter
 
 
 @click.group()
@@ -38,24 +44,337 @@ def index():
     """Elasticsearch index commands."""
 
 
+def refresh_templates(verbose=False, dry_run=False, err=False):
+    """Put the changed elasticsearch templates and display the changes.
+
+    The live templates are fetched once and only the templates differing
+    from their file are put.
+
+    :param verbose: display the templates diff.
+    :param dry_run: display the changes without putting the templates.
+    :param err: display the messages on the standard error.
+    """
+    changed = False
+    for name, path, body, patch in template_changes(current_search_client.indices.get_template()):
+        if not patch:
+            continue
+        changed = True
+        if dry_run:
+            click.secho(f"file:{path}, template {name} would be updated", fg="yellow", err=err)
+        else:
+            res = current_search_client.indices.put_template(name=name, body=body)
+            click.secho(f"file:{path}, ok: {res}", fg="green", err=err)
+        if verbose or dry_run:
+            click.secho("Diff in templates", fg="green", err=err)
+            click.echo(json.dumps(patch), err=err)
+    if not changed:
+        click.secho("Templates did not changed.", fg="yellow", err=err)
+
+
+def resource_mapping(resource):
+    """Get the mapping file path of a resource.
+
+    :param resource: the resource such as documents.
+    :returns: the mapping file path.
+    """
+    return list(current_search.aliases.get(resource).values()).pop()
+
+
+def create_index_from_mapping(resource, index):
+    """Create an index with the mapping of a given resource.
+
+    :param resource: the resource such as documents.
+    :param index: the index name.
+    """
+    current_search_client.indices.create(index, load_mapping(resource_mapping(resource)))
+
+
+def validate_slices(ctx, param, value):
+    """Validate the number of reindex slices."""
+    if value is None or value == "auto":
+        return value
+    try:
+        slices = int(value)
+    except ValueError:
+        slices = 0
+    if slices < 1:
+        raise click.BadParameter("must be a positive integer or auto")
+    return slices
+
+
+def reindex_options(func):
+    """Add the reindex tuning options to a command."""
+    options = [
+        click.option(
+            "--slices",
+            callback=validate_slices,
+            help="number of slices to parallelize the reindex, auto for one slice per shard",
+        ),
+        click.option("--size", type=int, help="number of documents per reindex batch, default=1000"),
+        click.option(
+            "--requests-per-second",
+            type=float,
+            help="throttle in sub-requests per second, default=-1 (no throttle)",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def start_reindex(source, destination, slices=None, size=None, requests_per_second=None, query=None, conflicts=None):
+    """Start a reindex task.
+
+    See: https://www.elastic.co/guide/en/elasticsearch/reference/7.10/docs-reindex.html
+
+    :param source: the source index.
+    :param destination: the destination index.
+    :param slices: number of slices or `auto`.
+    :param size: number of documents per batch.
+    :param requests_per_second: throttle in sub-requests per second.
+    :param query: reindex only the source documents matching this query.
+    :param conflicts: `proceed` to skip the documents with a newer version in
+        the destination index instead of aborting.
+    :returns: the task id.
+    """
+    body = {
+        "source": {"index": source},
+        "dest": {"index": destination, "version_type": "external_gte"},
+    }
+    if size:
+        body["source"]["size"] = size
+    if query:
+        body["source"]["query"] = query
+    if conflicts:
+        body["conflicts"] = conflicts
+    params = {"slices": slices, "requests_per_second": requests_per_second}
+    res = current_search_client.reindex(
+        body=body,
+        wait_for_completion=False,
+        **{key: value for key, value in params.items() if value is not None},
+    )
+    return res["task"]
+
+
+CATCH_UP_MARGIN = timedelta(seconds=60)
+"""Overlap between two catch-up passes.
+
+It covers the refresh interval of the source index and the clock skew between
+the indexing servers.
+"""
+
+
+def catch_up_options(func):
+    """Add the catch-up options to a command."""
+    options = [
+        click.option(
+            "--catch-up/--no-catch-up",
+            is_flag=True,
+            default=False,
+            help="reindex the documents changed during the reindex before and after the switch",
+        ),
+        click.option(
+            "--catch-up-field", default="_updated", help="date field of the last document change, default=_updated"
+        ),
+        click.option(
+            "--catch-up-threshold",
+            type=int,
+            default=100,
+            help="number of changed documents allowing the switch, default=100",
+        ),
+        click.option("--catch-up-passes", type=int, default=5, help="maximum number of catch-up passes, default=5"),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def utc_now():
+    """Get the current time of a catch-up checkpoint."""
+    return datetime.now(timezone.utc)
+
+
+def changed_since(field, since):
+    """Get the query of the documents changed since a checkpoint.
+
+    :param field: the date field of the last document change.
+    :param since: the checkpoint datetime.
+    :returns: the range query.
+    """
+    return {"range": {field: {"gte": (since - CATCH_UP_MARGIN).isoformat()}}}
+
+
+BULK_BUILD_SETTINGS = {"refresh_interval": "-1", "number_of_replicas": 0}
+"""Index settings speeding up the build of an index."""
+
+
+def bulk_build_options(func):
+    """Add the bulk build options to a command."""
+    options = [
+        click.option(
+            "-b",
+            "--bulk-build/--no-bulk-build",
+            "bulk_build",
+            is_flag=True,
+            default=False,
+            help="disable the refresh and the replicas of the new index during the reindex",
+        ),
+        click.option("--force-merge", type=int, help="force merge the new index to this number of segments"),
+        click.option(
+            "--wait-for-status",
+            type=click.Choice(["green", "yellow"]),
+            default="green",
+            help="health of the new index required before the switch, default=green",
+        ),
+        click.option("--build-timeout", type=int, default=600, help="seconds to wait for the new index health"),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def start_bulk_build(index):
+    """Disable the refresh and the replicas of an index.
+
+    :param index: the index name.
+    :returns: the original index settings.
+    """
+    settings = current_search_client.indices.get_settings(index=index)[index]["settings"]["index"]
+    # not defined settings are restored to their default value (None)
+    original = {key: settings.get(key) for key in BULK_BUILD_SETTINGS}
+    current_search_client.indices.put_settings(index=index, body={"index": BULK_BUILD_SETTINGS})
+    return original
+
+
+def finish_bulk_build(index, settings, force_merge=None, wait_for_status="green", timeout=600):
+    """Restore the settings of an index after its build.
+
+    :param index: the index name.
+    :param settings: the original index settings.
+    :param force_merge: number of segments to force merge to.
+    :param wait_for_status: required index health.
+    :param timeout: seconds to wait for the index health.
+    """
+    current_search_client.indices.put_settings(index=index, body={"index": settings})
+    if force_merge:
+        current_search_client.indices.forcemerge(index=index, max_num_segments=force_merge, request_timeout=timeout)
+    current_search_client.indices.refresh(index=index)
+    health = current_search_client.cluster.health(
+        index=index, wait_for_status=wait_for_status, timeout=f"{timeout}s", request_timeout=timeout + 10
+    )
+    if health.get("timed_out"):
+        raise TimeoutError(f"{index} is {health.get('status')} after {timeout} seconds")
+
+
+def task_errors(res):
+    """Get the errors of a completed task.
+
+    The version conflicts skipped with `conflicts=proceed` are not failures.
+
+    :param res: the tasks API response.
+    :returns: the task error or the reindex failures, None if there is none.
+    """
+    return res.get("error") or res.get("failures") or (res.get("response") or {}).get("failures") or None
+
+
+def wait_for_task(task, interval, verbose=False, as_json=False):
+    """Wait for the completion of a task.
+
+    :param task: the task id.
+    :param interval: maximum seconds between two progress updates.
+    :param verbose: display the task progress.
+    :param as_json: stream the task progress as JSON lines.
+    :returns: the tasks API response of the completed task.
+    """
+    progress = TaskProgress(task)
+    for _, res in TaskWaiter(current_search_client, [task], max_interval=interval):
+        if verbose and not as_json and not progress.samples and (task_info := res.get("task")):
+            click.secho(f"Watching task: {task} {task_info.get('description')}", fg="green")
+        progress.update(res)
+        if not res.get("completed") and (verbose or as_json):
+            progress.echo(as_json, prefix=task)
+    if as_json:
+        progress.echo(as_json)
+    elif verbose:
+        click.secho(f"Finished task: {task} {progress.render()}", fg="yellow")
+        click.secho(f"{pformat(res.get('response'))}", fg="yellow")
+    return res
+
+
+def task_total(res):
+    """Get the number of documents processed by a completed reindex task.
+
+    :param res: the tasks API response.
+    :returns: the number of documents.
+    """
+    return (res.get("response") or {}).get("total", 0)
+
+
+ALIAS_PROPERTIES = ["filter", "index_routing", "search_routing", "is_write_index", "is_hidden"]
+"""Alias properties kept when the aliases are moved to another index."""
+
+
+def switch_aliases(old, new):
+    """Move all the aliases of an index to another index.
+
+    All the aliases are moved atomically in a single aliases request, with
+    their properties such as the write index flag, thus the searches never
+    see both or none of the indices.
+
+    See: https://www.elastic.co/guide/en/elasticsearch/reference/7.10/indices-aliases.html
+
+    :param old: full name of the old index
+    :param new: full name of the new index
+    :returns: the alias actions.
+    """
+    aliases = current_search_client.indices.get_alias(index=old)[old]["aliases"]
+    actions = []
+    for alias, properties in aliases.items():
+        add = {key: properties[key] for key in ALIAS_PROPERTIES if key in properties}
+        actions.append({"add": {"index": new, "alias": alias, **add}})
+        actions.append({"remove": {"index": old, "alias": alias}})
+    if actions:
+        current_search_client.indices.update_aliases(body={"actions": actions})
+    return actions
+
+
 @index.command("reindex")
 @with_appcontext
 @es_version_check
 @click.argument("source")
 @click.argument("destination")
-def reindex(source, destination):
+@reindex_options
+def reindex(source, destination, slices, size, requests_per_second):
     """Reindex from source.
 
     See: https://www.elastic.co/guide/en/elasticsearch/reference/7.10/docs-reindex.html
     """
-    res = current_search_client.reindex(
-        body={
-            "source": {"index": source},
-            "dest": {"index": destination, "version_type": "external_gte"},
-        },
-        wait_for_completion=False,
-    )
-    click.secho(f"Task: {res['task']}", fg="green")
+    task = start_reindex(source, destination, slices, size, requests_per_second)
+    click.secho(f"Task: {task}", fg="green")
+
+
+@index.command("rethrottle")
+@with_appcontext
+@es_version_check
+@click.argument("task")
+@click.argument("requests_per_second", type=float)
+def rethrottle(task, requests_per_second):
+    """Change the throttle of a running reindex task.
+
+    See: https://www.elastic.co/guide/en/elasticsearch/reference/7.10/docs-reindex.html#docs-reindex-rethrottle
+
+    Example: `rero es index rethrottle <task> -- -1` disables the throttle.
+
+    :param task: task id.
+    :param requests_per_second: sub-requests per second, -1 to disable the
+        throttle.
+    """
+    try:
+        res = current_search_client.reindex_rethrottle(task, requests_per_second=requests_per_second)
+        click.secho(f"{pformat(res)}", fg="green")
+    except Exception as err:
+        click.secho(f"Error: {err}", fg="red")
+        sys.exit(1)
 
 
 @index.command("open")
@@ -93,10 +412,7 @@ def switch_index(old, new):
     :param old: full name of the old index
     :param new: full name of the fresh created index
     """
-    aliases = current_search_client.indices.get_alias().get(old).get("aliases").keys()
-    for alias in aliases:
-        current_search_client.indices.put_alias(new, alias)
-        current_search_client.indices.delete_alias(old, alias)
+    switch_aliases(old, new)
     click.secho("Successfully switched.", fg="green")
 
 
@@ -116,48 +432,117 @@ def create_index(resource, index, verbose, templates):
     :param templates: update also the es templates.
     """
     if templates:
-        tbody = current_search_client.indices.get_template()
-        for tmpl in current_search.put_templates():
-            click.secho(f"file:{tmpl[0]}, ok: {tmpl[1]}", fg="green")
-            new_tbody = current_search_client.indices.get_template()
-            if patch := make_patch(new_tbody, tbody):
-                click.secho("Templates are updated.", fg="green")
-                if verbose:
-                    click.secho("Diff in templates", fg="green")
-                    click.echo(patch)
-            else:
-                click.secho("Templates did not changed.", fg="yellow")
-
-    f_mapping = list(current_search.aliases.get(resource).values()).pop()
-    with open(f_mapping) as mapping:
-        current_search_client.indices.create(index, json.load(mapping))
+        refresh_templates(verbose)
+    create_index_from_mapping(resource, index)
     click.secho(f"Index {index} has been created.", fg="green")
 
 
+def run_concurrently(func, bodies, workers):
+    """Call an indices API for several indices concurrently.
+
+    :param func: the indices API method, called with an index and a body.
+    :param bodies: dict - the request body of each index.
+    :param workers: maximum number of concurrent requests.
+    :returns: a dict with the response or the raised exception of each
+        index.
+    """
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(func, index=index, body=body): index for index, body in bodies.items()}
+        for future in as_completed(futures):
+            results[futures[future]] = future.exception() or future.result()
+    return results
+
+
+@index.command("templates")
+@with_appcontext
+@es_version_check
+@click.option("-v", "--verbose/--no-verbose", "verbose", is_flag=True, default=False)
+@click.option("-d", "--dry-run", is_flag=True, default=False, help="display the changes without updating")
+def templates(verbose, dry_run):
+    """Update the changed elasticsearch templates.
+
+    :param verbose: display the templates diff.
+    :param dry_run: display the changes without updating the templates.
+    """
+    refresh_templates(verbose, dry_run)
+
+
 @index.command()
 @click.option("--aliases", "-a", multiple=True, help="all if not specified")
 @click.option("-s", "--settings/--no-settings", "settings", is_flag=True, default=False)
+@click.option("-w", "--workers", default=4, type=int, help="maximum number of concurrent updates, default=4")
+@click.option("-d", "--dry-run", is_flag=True, default=False, help="display the changes without updating")
 @with_appcontext
-def update_mapping(aliases, settings):
-    """Update the mapping of a given alias."""
+def update_mapping(aliases, settings, workers, dry_run):
+    """Update the mapping of a given alias.
+
+    The state of the indices is fetched at once and only the changed
+    mappings and settings are updated, the fields or settings of the live
+    indices missing in the files are ignored. The indices are updated
+    concurrently. With the settings, all the indices having changed settings
+    are closed at once, their settings are updated and they are reopened
+    together before the mappings update.
+
+    :param aliases: the aliases to update, all if not specified.
+    :param settings: update also the index settings.
+    :param workers: maximum number of concurrent updates.
+    :param dry_run: display the changes without updating the indices.
+    """
     if not aliases:
         aliases = current_search.aliases.keys()
+    # the threads can not use the application context
+    client = current_search_client._get_current_object()
+    mappings = {}
     for alias in aliases:
         for index, f_mapping in iter(current_search.aliases.get(alias).items()):
-            with open(f_mapping) as mapping:
-                mapping = json.load(mapping)
-            try:
-                if mapping.get("settings") and settings:
-                    current_search_client.indices.close(index=index)
-                    current_search_client.indices.put_settings(body=mapping.get("settings"), index=index)
-                    current_search_client.indices.open(index=index)
-                res = current_search_client.indices.put_mapping(body=mapping.get("mappings"), index=index)
-            except Exception as excep:
-                click.secho(f"error: {excep}", fg="red")
-            if res.get("acknowledged"):
-                click.secho(f"index: {index} has been successfully updated", fg="green")
-            else:
-                click.secho(f"error: {res}", fg="red")
+            mappings[index] = load_mapping(f_mapping)
+
+    live = live_indices(list(mappings), client)
+    changes = {index: index_changes(data, live.get(index), settings) for index, data in mappings.items()}
+    for index, index_diff in changes.items():
+        if not index_diff:
+            click.secho(f"index: {index} is up to date", fg="yellow")
+        elif dry_run:
+            click.secho(f"index: {index} would be updated", fg="yellow")
+            for key, patch in index_diff.items():
+                click.echo(f"{key}: {json.dumps(patch)}")
+    if dry_run:
+        return
+
+    results = {}
+    if bodies := {index: mappings[index]["settings"] for index, diff in changes.items() if "settings" in diff}:
+        names = ",".join(bodies)
+        try:
+            client.indices.close(index=names)
+        except Exception as excep:
+            click.secho(f"error: {excep}", fg="red")
+            sys.exit(1)
+        try:
+            results = run_concurrently(client.indices.put_settings, bodies, workers)
+        finally:
+            client.indices.open(index=names)
+    # the mappings of the indices with settings errors are not updated
+    errors = {index: res for index, res in results.items() if isinstance(res, Exception)}
+    bodies = {
+        index: mappings[index].get("mappings")
+        for index, diff in changes.items()
+        if "mappings" in diff and index not in errors
+    }
+    results.update(run_concurrently(client.indices.put_mapping, bodies, workers))
+
+    for index in mappings:
+        if index not in results:
+            continue
+        res = results[index]
+        if isinstance(res, Exception):
+            click.secho(f"error: {res}", fg="red")
+        elif res.get("acknowledged"):
+            click.secho(f"index: {index} has been successfully updated", fg="green")
+        else:
+            click.secho(f"error: {res}", fg="red")
+    if any(isinstance(res, Exception) or not res.get("acknowledged") for res in results.values()):
+        sys.exit(1)
 
 
 @index.command("move")
@@ -168,80 +553,320 @@ def update_mapping(aliases, settings):
 @click.argument("new")
 @click.option("-t", "--templates/--no-templates", "templates", is_flag=True, default=True)
 @click.option("-v", "--verbose/--no-verbose", "verbose", is_flag=True, default=False)
-@click.option("-n", "--interval", default=1, type=int, help="seconds to wait between updates")
-def move_index(resource, old, new, templates, verbose, interval):
+@click.option(
+    "-n", "--interval", default=30, type=int, help="maximum seconds between two progress updates, 0 to not wait"
+)
+@click.option(
+    "--json", "as_json", is_flag=True, default=False, help="stream the progress as JSON lines, messages on stderr"
+)
+@reindex_options
+@bulk_build_options
+@catch_up_options
+def move_index(
+    resource,
+    old,
+    new,
+    templates,
+    verbose,
+    interval,
+    as_json,
+    slices,
+    size,
+    requests_per_second,
+    bulk_build,
+    force_merge,
+    wait_for_status,
+    build_timeout,
+    catch_up,
+    catch_up_field,
+    catch_up_threshold,
+    catch_up_passes,
+):
     """Move index using the elasticsearch resource.
 
+    In bulk build mode, the refresh and the replicas of the new index are
+    disabled during the reindex. The original settings are restored once
+    the reindex is finished and the aliases are switched when the new index
+    reaches the required health.
+
+    In catch-up mode, the documents changed in the old index since the
+    previous pass (according to `catch_up_field`) are reindexed again until
+    their number is below `catch_up_threshold`, then the aliases are
+    switched and a last pass reindexes the changes made before the switch.
+    The documents deleted during the move are not removed from the new index.
+
     :param resource: the resource such as documents.
     :param old: full name of the old index
     :param new: full name of the fresh created index
     :param verbose: display additional message.
     :param templates: update also the es templates.
+    :param interval: maximum seconds between two progress updates.
+    :param as_json: stream the reindex progress as JSON lines.
+    :param slices: number of reindex slices or `auto`.
+    :param size: number of documents per reindex batch.
+    :param requests_per_second: reindex throttle.
+    :param bulk_build: disable the refresh and the replicas during the
+        reindex.
+    :param force_merge: number of segments to force merge the new index to.
+    :param wait_for_status: new index health required before the switch.
+    :param build_timeout: seconds to wait for the new index health.
+    :param catch_up: reindex the documents changed during the move.
+    :param catch_up_field: date field of the last document change.
+    :param catch_up_threshold: number of changed documents allowing the
+        switch.
+    :param catch_up_passes: maximum number of catch-up passes before the
+        switch.
     """
-    # create_index(resource, index, verbose, templates)
+    # the JSON lines are the only output on stdout
+    echo = partial(click.secho, err=as_json)
     try:
         if templates:
-            tbody = current_search_client.indices.get_template()
-            for tmpl in current_search.put_templates():
-                click.secho(f"file:{tmpl[0]}, ok: {tmpl[1]}", fg="green")
-                new_tbody = current_search_client.indices.get_template()
-                if patch := make_patch(new_tbody, tbody):
-                    click.secho("Templates are updated.", fg="green")
-                    if verbose:
-                        click.secho("Diff in templates", fg="green")
-                        click.echo(patch)
-                else:
-                    click.secho("Templates did not changed.", fg="yellow")
-
-        f_mapping = list(current_search.aliases.get(resource).values()).pop()
-        with open(f_mapping) as mapping:
-            mapping = json.load(mapping)
-        current_search_client.indices.create(new, mapping)
-        click.secho(f"Index {new} has been created.", fg="green")
+            refresh_templates(verbose, err=as_json)
+        create_index_from_mapping(resource, new)
+        echo(f"Index {new} has been created.", fg="green")
+        if bulk_build:
+            settings = start_bulk_build(new)
     except Exception as err:
-        click.secho(f"ERROR CREATE: {err}", fg="red")
+        echo(f"ERROR CREATE: {err}", fg="red")
         sys.exit(1)
 
-    res = current_search_client.reindex(
-        body={
-            "source": {"index": old},
-            "dest": {"index": new, "version_type": "external_gte"},
-        },
-        wait_for_completion=False,
-    )
-    task = res["task"]
-    click.secho(f"Task: {task}", fg="green")
+    since = utc_now()
+    task = start_reindex(old, new, slices, size, requests_per_second)
+    echo(f"Task: {task}", fg="green")
     if interval == 0:
+        if bulk_build:
+            echo(f"The settings of {new} must be restored after the reindex: {settings}", fg="yellow")
+        if catch_up:
+            echo(f"The documents changed since {since.isoformat()} must be reindexed.", fg="yellow")
         return
-    count = 0
-    # wait for task
-    res = current_search_client.tasks.get(task)
-    while not res.get("completed"):
-        task_info = res.get("task")
-        if verbose and task_info:
-            click.secho(f"Watching task: {task} {count} seconds ...", fg="green")
-            click.secho(f"{task_info.get('description')}", fg="green")
-            click.secho(f"{pformat(task_info.get('status'))}", fg="green")
-        sleep(interval)
-        count += interval
-        res = current_search_client.tasks.get(task)
-    if verbose:
-        click.secho(f"Finished task: {task} {count} seconds ...", fg="yellow")
-        click.secho(f"{pformat(res.get('response'))}", fg="yellow")
-    if failures := res.get("failures"):
-        click.secho(f"ERROR REINDEX: {failures}", fg="red")
+    res = wait_for_task(task, interval, verbose, as_json)
+    if failures := task_errors(res):
+        echo(f"ERROR REINDEX: {failures}", fg="red")
         sys.exit(2)
 
+    def catch_up_pass(since):
+        """Reindex the documents changed since a checkpoint."""
+        query = changed_since(catch_up_field, since)
+        # the documents written in the new index since the switch are newer
+        task = start_reindex(old, new, slices, size, requests_per_second, query, conflicts="proceed")
+        res = wait_for_task(task, interval, verbose, as_json)
+        if failures := task_errors(res):
+            echo(f"ERROR CATCH-UP: {failures}", fg="red")
+            sys.exit(2)
+        echo(f"Catch-up: {task_total(res)} changed documents reindexed.", fg="green")
+        return task_total(res)
+
+    for _ in range(catch_up_passes if catch_up else 0):
+        checkpoint = utc_now()
+        changed = catch_up_pass(since)
+        since = checkpoint
+        if changed <= catch_up_threshold:
+            break
+
+    if bulk_build:
+        try:
+            finish_bulk_build(new, settings, force_merge, wait_for_status, build_timeout)
+            echo(f"Settings of {new} restored.", fg="green")
+        except Exception as err:
+            echo(f"ERROR BUILD: {err}", fg="red")
+            sys.exit(4)
+
     # switch index
     try:
-        aliases = current_search_client.indices.get_alias().get(old).get("aliases").keys()
-        for alias in aliases:
-            current_search_client.indices.put_alias(new, alias)
-            current_search_client.indices.delete_alias(old, alias)
-        click.secho("Successfully switched.", fg="green")
+        switch_aliases(old, new)
+        echo("Successfully switched.", fg="green")
     except Exception as err:
-        click.secho(f"ERROR SWITCH: {err}", fg="red")
+        echo(f"ERROR SWITCH: {err}", fg="red")
         sys.exit(3)
+    if catch_up:
+        # the writes go to the new index since the switch
+        catch_up_pass(since)
+
+
+def movable_resources():
+    """Get the resources which can be moved.
+
+    :returns: the aliases with a single index mapping.
+    """
+    return [
+        alias
+        for alias, indices in current_search.aliases.items()
+        if len(indices) == 1 and all(isinstance(mapping, str) for mapping in indices.values())
+    ]
+
+
+@index.command("move-batch")
+@with_appcontext
+@es_version_check
+@click.argument("resources", nargs=-1)
+@click.option("-a", "--all", "all_resources", is_flag=True, default=False, help="Move all the resources.")
+@click.option("-c", "--concurrency", default=2, type=int, help="maximum number of concurrent reindex tasks")
+@click.option("-s", "--suffix", help="suffix of the new indices, default to the current timestamp")
+@click.option("-t", "--templates/--no-templates", "templates", is_flag=True, default=True)
+@click.option("-v", "--verbose/--no-verbose", "verbose", is_flag=True, default=False)
+@click.option(
+    "-n", "--interval", default=30, type=int, help="maximum seconds between two progress updates, 0 for the shortest"
+)
+@reindex_options
+@bulk_build_options
+@catch_up_options
+def move_batch(
+    resources,
+    all_resources,
+    concurrency,
+    suffix,
+    templates,
+    verbose,
+    interval,
+    slices,
+    size,
+    requests_per_second,
+    bulk_build,
+    force_merge,
+    wait_for_status,
+    build_timeout,
+    catch_up,
+    catch_up_field,
+    catch_up_threshold,
+    catch_up_passes,
+):
+    """Move the indices of several resources concurrently.
+
+    For each resource, a new index is created and the index of the resource
+    alias is reindexed into it. At most `concurrency` reindex tasks run at
+    the same time and the aliases of each resource are switched as soon as
+    its own task is finished.
+
+    :param resources: the resources such as documents.
+    :param all_resources: move all the resources.
+    :param concurrency: maximum number of concurrent reindex tasks.
+    :param suffix: suffix of the new indices.
+    :param verbose: display additional message.
+    :param templates: update also the es templates.
+    :param interval: maximum seconds between two progress updates.
+    :param slices: number of reindex slices or `auto`.
+    :param size: number of documents per reindex batch.
+    :param requests_per_second: reindex throttle of each task.
+    :param bulk_build: disable the refresh and the replicas during the
+        reindex (see `move`).
+    :param force_merge: number of segments to force merge the new indices to.
+    :param wait_for_status: new indices health required before the switch.
+    :param build_timeout: seconds to wait for the new indices health.
+    :param catch_up: reindex the documents changed during the move (see
+        `move`).
+    :param catch_up_field: date field of the last document change.
+    :param catch_up_threshold: number of changed documents allowing the
+        switch.
+    :param catch_up_passes: maximum number of catch-up passes before the
+        switch.
+    """
+    if all_resources:
+        resources = movable_resources()
+    if not resources:
+        click.secho("ERROR: no resource to move.", fg="red")
+        sys.exit(1)
+    suffix = suffix or current_search.current_suffix
+    if templates:
+        refresh_templates(verbose)
+
+    pending = list(resources)
+    running = {}
+    errors = {}
+    waiter = TaskWaiter(current_search_client, max_interval=interval)
+
+    def start_task(move, task):
+        """Wait for the task of a move."""
+        running[task] = move
+        move["progress"] = TaskProgress(task)
+        waiter.add(task)
+
+    def start_next():
+        """Start the next reindex tasks."""
+        while pending and len(running) < concurrency:
+            resource = pending.pop(0)
+            try:
+                old = next(iter(current_search_client.indices.get_alias(name=build_alias_name(resource))))
+                new = build_index_name(next(iter(current_search.aliases[resource])), suffix=suffix)
+                create_index_from_mapping(resource, new)
+                settings = start_bulk_build(new) if bulk_build else None
+                since = utc_now()
+                task = start_reindex(old, new, slices, size, requests_per_second)
+            except Exception as err:
+                errors[resource] = f"ERROR CREATE: {err}"
+                click.secho(f"{resource}: {errors[resource]}", fg="red")
+                continue
+            move = {
+                "resource": resource,
+                "old": old,
+                "new": new,
+                "settings": settings,
+                "since": since,
+                "passes": 0,
+                "switched": False,
+            }
+            start_task(move, task)
+            click.secho(f"{resource}: reindex {old} -> {new}, task: {task}", fg="green")
+
+    def start_catch_up(move):
+        """Start a catch-up pass of a move."""
+        query = changed_since(catch_up_field, move["since"])
+        move["since"] = utc_now()
+        move["passes"] += 1
+        task = start_reindex(move["old"], move["new"], slices, size, requests_per_second, query, conflicts="proceed")
+        start_task(move, task)
+        click.secho(f"{move['resource']}: catch-up {move['old']} -> {move['new']}, task: {task}", fg="green")
+
+    def finish(move, res):
+        """Switch the aliases of a move once its task is completed."""
+        resource, old, new = move["resource"], move["old"], move["new"]
+        if failures := task_errors(res):
+            errors[resource] = f"ERROR {'CATCH-UP' if move['passes'] else 'REINDEX'}: {failures}"
+            click.secho(f"{resource}: {errors[resource]}", fg="red")
+            return
+        if move["passes"]:
+            click.secho(f"{resource}: catch-up {task_total(res)} changed documents reindexed.", fg="green")
+        if move["switched"]:
+            return
+        if (
+            catch_up
+            and move["passes"] < catch_up_passes
+            and (not move["passes"] or task_total(res) > catch_up_threshold)
+        ):
+            start_catch_up(move)
+            return
+        try:
+            if bulk_build:
+                finish_bulk_build(new, move["settings"], force_merge, wait_for_status, build_timeout)
+        except Exception as err:
+            errors[resource] = f"ERROR BUILD: {err}"
+            click.secho(f"{resource}: {errors[resource]}", fg="red")
+            return
+        try:
+            switch_aliases(old, new)
+            click.secho(f"{resource}: successfully switched to {new}.", fg="green")
+        except Exception as err:
+            errors[resource] = f"ERROR SWITCH: {err}"
+            click.secho(f"{resource}: {errors[resource]}", fg="red")
+            return
+        if catch_up:
+            # the writes go to the new index since the switch
+            move["switched"] = True
+            start_catch_up(move)
+
+    start_next()
+    # combined progress and switch of the finished tasks
+    for task, res in waiter:
+        move = running[task]
+        if not res.get("completed"):
+            move["progress"].update(res).echo(prefix=move["resource"])
+            continue
+        del running[task]
+        finish(move, res)
+        start_next()
+
+    click.secho(f"Moved: {len(resources) - len(errors)}/{len(resources)}", fg="red" if errors else "green")
+    if errors:
+        sys.exit(2)
 
 
 @index.command()
@@ -0,0 +1,186 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Loading and comparison of the local mappings and templates.
+
+The cluster returns the settings flattened with string values and the
+mappings with the fields added since the index creation. The local and live
+definitions are normalized before the comparison, a remaining difference
+only results in an unneeded update.
+"""
+
+import hashlib
+import json
+import os
+
+from flask import current_app
+from invenio_search import current_search
+from invenio_search.utils import build_alias_name
+from jsonpatch import make_patch
+
+TEMPLATE_PREFIX_PATTERN = "__SEARCH_INDEX_PREFIX__"
+"""Pattern replaced by the index prefix in the templates."""
+
+# parsed mapping files by path: (modification time, mapping)
+_mappings_cache = {}
+
+
+def load_mapping(path):
+    """Load a mapping file.
+
+    The parsed files are cached by path and modification time, thus a file
+    is parsed once as long as it is not modified. The returned mapping is
+    shared and must not be modified.
+
+    :param path: the mapping file path.
+    :returns: the mapping file content.
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _mappings_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path) as mapping:
+            cached = _mappings_cache[path] = (mtime, json.load(mapping))
+    return cached[1]
+
+
+def load_template(path):
+    """Load a template file.
+
+    :param path: the template file path.
+    :returns: the template body with the index prefix.
+    """
+    with open(path) as template:
+        body = template.read()
+    return json.loads(body.replace(TEMPLATE_PREFIX_PATTERN, current_app.config.get("SEARCH_INDEX_PREFIX") or ""))
+
+
+def normalize_value(value):
+    """Get a setting value as returned by the cluster."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, list):
+        return [normalize_value(item) for item in value]
+    return str(value)
+
+
+def normalize_settings(settings, prefix=""):
+    """Flatten index settings.
+
+    :param settings: the nested or flattened settings.
+    :param prefix: the prefix of the settings keys.
+    :returns: the settings with dotted keys without the `index.` prefix and
+        string values.
+    """
+    flat = {}
+    for key, value in settings.items():
+        if isinstance(value, dict):
+            flat.update(normalize_settings(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}".removeprefix("index.")] = normalize_value(value)
+    return flat
+
+
+def normalize_template(body):
+    """Get the comparable part of a template.
+
+    :param body: the local or live template.
+    :returns: the normalized template.
+    """
+    patterns = body.get("index_patterns", [])
+    return {
+        "index_patterns": [patterns] if isinstance(patterns, str) else patterns,
+        "order": body.get("order", 0),
+        "version": body.get("version"),
+        "settings": normalize_settings(body.get("settings", {})),
+        "mappings": body.get("mappings", {}),
+        "aliases": body.get("aliases", {}),
+    }
+
+
+def fingerprint(data):
+    """Get the fingerprint of a JSON document.
+
+    :param data: the JSON serializable data.
+    :returns: a digest independent of the keys order.
+    """
+    return hashlib.sha1(json.dumps(data, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def additive_diff(live, local):
+    """Get the changes to apply to a mapping or settings.
+
+    The mappings and settings updates are merged with the existing ones,
+    thus the live values not defined locally are not changes.
+
+    :param live: the live mapping or settings.
+    :param local: the local mapping or settings.
+    :returns: the list of JSON patch operations.
+    """
+    if fingerprint(live) == fingerprint(local):
+        return []
+    return [operation for operation in make_patch(live, local) if operation["op"] != "remove"]
+
+
+def template_changes(live_templates):
+    """Compare the registered templates to the live ones.
+
+    :param live_templates: the response of the get template API.
+    :returns: a generator of (name, path, body, patch) tuples, patch is the
+        list of the JSON patch operations, empty if the template did not
+        change.
+    """
+    for template, path in current_search.templates.items():
+        name = build_alias_name(template)
+        body = load_template(path)
+        local = normalize_template(body)
+        live = normalize_template(live_templates[name]) if name in live_templates else {}
+        patch = [] if fingerprint(live) == fingerprint(local) else list(make_patch(live, local))
+        yield name, path, body, patch
+
+
+def live_indices(names, client):
+    """Get the state of indices at once.
+
+    :param names: the index or alias names.
+    :param client: the search client.
+    :returns: a dict with the list of states of the indices of each name.
+    """
+    state = client.indices.get(index=",".join(names), ignore_unavailable=True)
+    live = {}
+    for index, data in state.items():
+        for name in [index, *data.get("aliases", {})]:
+            if name in names:
+                live.setdefault(name, []).append(data)
+    return live
+
+
+def index_changes(local, states, settings=False):
+    """Compare a mapping file to the live indices.
+
+    :param local: the mapping file content.
+    :param states: the states of the live indices.
+    :param settings: compare also the settings.
+    :returns: a dict with the `mappings` and `settings` changes, without
+        the unchanged parts.
+    """
+    changes = {}
+    for state in states or [{}]:
+        if patch := additive_diff(state.get("mappings", {}), local.get("mappings", {})):
+            changes.setdefault("mappings", patch)
+        if settings and local.get("settings"):
+            live_settings = normalize_settings(state.get("settings", {}))
+            if patch := additive_diff(live_settings, normalize_settings(local["settings"])):
+                changes.setdefault("settings", patch)
+    return changes
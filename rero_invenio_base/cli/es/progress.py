@@ -0,0 +1,151 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Elasticsearch tasks progress."""
+
+import json
+from collections import deque
+from datetime import timedelta
+from time import monotonic
+
+import click
+
+
+def format_duration(seconds):
+    """Format a duration.
+
+    :param seconds: the duration in seconds or None.
+    :returns: the duration as `H:MM:SS` or `-` if unknown.
+    """
+    if seconds is None:
+        return "-"
+    return str(timedelta(seconds=round(seconds)))
+
+
+class TaskProgress:
+    """Progress of a reindex like task.
+
+    The rate is computed on the documents processed during the last `window`
+    seconds, thus the estimated time of arrival follows the throttle changes
+    and the cluster load.
+    """
+
+    def __init__(self, task, window=60):
+        """Init magic method.
+
+        :param task: string - the task id.
+        :param window: integer - seconds of the rate sliding window.
+        """
+        self.task = task
+        self.window = window
+        self.samples = deque()
+        self.started = monotonic()
+        self.description = None
+        self.completed = False
+        self.failures = None
+        self.done = 0
+        self.total = 0
+
+    def update(self, res, now=None):
+        """Update the progress with a tasks API response.
+
+        :param res: the tasks API response.
+        :param now: monotonic time of the response, default to now.
+        :returns: the progress itself.
+        """
+        now = monotonic() if now is None else now
+        info = res.get("task") or {}
+        self.description = info.get("description", self.description)
+        self.completed = bool(res.get("completed"))
+        status = info.get("status") or {}
+        if self.completed:
+            response = res.get("response") or {}
+            status = response or status
+            self.failures = res.get("error") or response.get("failures") or None
+        self.done = status.get("created", 0) + status.get("updated", 0)
+        self.total = status.get("total", 0)
+        self.samples.append((now, self.done))
+        # keep at least two samples to compute a rate
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+        return self
+
+    @property
+    def elapsed(self):
+        """Seconds since the progress creation."""
+        return (self.samples[-1][0] if self.samples else monotonic()) - self.started
+
+    @property
+    def percent(self):
+        """Percentage of processed documents."""
+        if not self.total:
+            return 100.0 if self.completed else 0.0
+        return 100.0 * self.done / self.total
+
+    @property
+    def rate(self):
+        """Processed documents per second in the sliding window."""
+        if len(self.samples) < 2:
+            return None
+        (start, start_done), (end, end_done) = self.samples[0], self.samples[-1]
+        if end <= start:
+            return None
+        return (end_done - start_done) / (end - start)
+
+    @property
+    def eta(self):
+        """Estimated remaining seconds, None if unknown."""
+        if self.completed:
+            return 0
+        rate = self.rate
+        if not rate or not self.total:
+            return None
+        return max(self.total - self.done, 0) / rate
+
+    def to_dict(self):
+        """Get the progress as a serializable dict."""
+        rate = self.rate
+        return {
+            "task": self.task,
+            "completed": self.completed,
+            "done": self.done,
+            "total": self.total,
+            "percent": round(self.percent, 2),
+            "docs_per_second": None if rate is None else round(rate, 2),
+            "eta": None if self.eta is None else round(self.eta, 1),
+            "elapsed": round(self.elapsed, 1),
+            "failures": self.failures,
+        }
+
+    def render(self):
+        """Get the progress as a human readable line."""
+        rate = self.rate
+        rate = "-" if rate is None else f"{rate:.0f}"
+        return (
+            f"{self.done}/{self.total} ({self.percent:.1f}%) {rate} docs/s "
+            f"elapsed {format_duration(self.elapsed)} ETA {format_duration(self.eta)}"
+        )
+
+    def echo(self, as_json=False, prefix=None):
+        """Display the progress.
+
+        :param as_json: display the progress as a JSON line.
+        :param prefix: text displayed before the human readable progress.
+        """
+        if as_json:
+            click.echo(json.dumps(self.to_dict()))
+            return
+        prefix = f"{prefix}: " if prefix else ""
+        click.secho(f"{prefix}{self.render()}", fg="green" if self.completed else "yellow")
@@ -15,9 +15,10 @@
 
 """Click elasticsearch tasks command-line utilities."""
 
+import json
 import sys
+from collections import defaultdict
 from pprint import pformat
-from time import sleep
 
 import click
 from invenio_search import current_search_client
@@ -29,6 +30,9 @@ except ImportError:
 
 from invenio_search.cli import with_appcontext
 
+from .progress import TaskProgress, format_duration
+from .waiter import TaskWaiter
+
 
 def abort_if_false(ctx, param, value):
     """Abort command is value is False."""
@@ -67,13 +71,116 @@ def task_get(task):
         sys.exit(1)
 
 
+TASK_ACTIONS = {
+    "reindex": "indices:data/write/reindex",
+    "update_by_query": "indices:data/write/update/byquery",
+    "delete_by_query": "indices:data/write/delete/byquery",
+    "snapshot": "cluster:admin/snapshot/*",
+}
+"""Shortcuts of the task actions filters."""
+
+
+def task_row(task_id, info):
+    """Get the displayed values of a task.
+
+    :param task_id: the task id.
+    :param info: the task info of the tasks API.
+    :returns: a dict with the task values.
+    """
+    status = info.get("status") or {}
+    running_time = info.get("running_time_in_nanos", 0) / 1e9
+    docs = status.get("created", 0) + status.get("updated", 0) + status.get("deleted", 0)
+    return {
+        "id": task_id,
+        "action": info.get("action"),
+        "node": info.get("node"),
+        "parent_task_id": info.get("parent_task_id"),
+        "running_time": round(running_time, 3),
+        "docs": docs,
+        "total": status.get("total"),
+        "docs_per_second": round(docs / running_time, 2) if running_time else None,
+        "cancellable": info.get("cancellable"),
+        "description": info.get("description"),
+    }
+
+
 @task.command("list")
 @with_appcontext
 @es_version_check
-def task_list():
-    """Get task list."""
-    res = current_search_client.tasks.list()
-    click.secho(f"{pformat(res)}", fg="green")
+@click.option(
+    "-a",
+    "--action",
+    "actions",
+    multiple=True,
+    help=f"action filter, wildcards are allowed, shortcuts: {', '.join(TASK_ACTIONS)}",
+)
+@click.option("-n", "--node", "nodes", multiple=True, help="node id or name")
+@click.option("-p", "--parent", help="parent task id")
+@click.option("-d", "--detailed", is_flag=True, default=False, help="get the task status and description")
+@click.option("-t", "--min-running-time", type=float, help="only the tasks running for at least these seconds")
+@click.option("--json", "as_json", is_flag=True, default=False, help="stream the tasks as JSON lines")
+def task_list(actions, nodes, parent, detailed, min_running_time, as_json):
+    """Get task list.
+
+    The tasks are displayed one per line, followed by the number of tasks,
+    the total running time, the processed documents and the sum of the
+    documents per second of each action. The documents are counted in the
+    detailed status of the reindex, update by query and delete by query
+    tasks. The slices of a listed task are not summed, the status of the
+    parent task already includes them.
+
+    :param actions: actions filter such as reindex.
+    :param nodes: nodes filter.
+    :param parent: parent task id filter.
+    :param detailed: get the tasks status and description.
+    :param min_running_time: minimum running time in seconds.
+    :param as_json: stream the tasks as JSON lines.
+    """
+    params = {
+        "actions": ",".join(TASK_ACTIONS.get(action, action) for action in actions),
+        "nodes": ",".join(nodes),
+        "parent_task_id": parent,
+        "detailed": detailed or None,
+    }
+    res = current_search_client.tasks.list(group_by="none", **{key: value for key, value in params.items() if value})
+    summary = defaultdict(lambda: {"count": 0, "running_time": 0, "docs": 0, "docs_per_second": 0})
+    if not as_json:
+        click.secho(f"{'task':<32} {'action':<40} {'time':>10} {'docs':>10} {'docs/s':>9}", bold=True)
+    # the tasks are a list without grouping
+    rows = [task_row(f"{info['node']}:{info['id']}", info) for info in res.get("tasks", [])]
+    rows = [row for row in rows if not min_running_time or row["running_time"] >= min_running_time]
+    actions_by_id = {row["id"]: row["action"] for row in rows}
+    for row in rows:
+        task_id = row["id"]
+        if actions_by_id.get(row["parent_task_id"]) != row["action"]:
+            action = summary[row["action"]]
+            action["count"] += 1
+            action["running_time"] += row["running_time"]
+            action["docs"] += row["docs"]
+            action["docs_per_second"] += row["docs_per_second"] or 0
+        if as_json:
+            click.echo(json.dumps({"type": "task", **row}))
+            continue
+        rate = "-" if row["docs_per_second"] is None else f"{row['docs_per_second']:.0f}"
+        click.echo(
+            f"{task_id:<32} {row['action']:<40} {format_duration(row['running_time']):>10} {row['docs']:>10} {rate:>9}"
+        )
+        if detailed and row["description"]:
+            click.secho(f"  {row['description']}", fg="yellow")
+
+    if not as_json:
+        click.secho(f"{'action':<40} {'tasks':>6} {'time':>10} {'docs':>10} {'docs/s':>9}", bold=True)
+    for name, action in sorted(summary.items()):
+        action["running_time"] = round(action["running_time"], 3)
+        action["docs_per_second"] = round(action["docs_per_second"], 2)
+        if as_json:
+            click.echo(json.dumps({"type": "action", "action": name, **action}))
+            continue
+        click.secho(
+            f"{name:<40} {action['count']:>6} {format_duration(action['running_time']):>10} "
+            f"{action['docs']:>10} {action['docs_per_second']:>9.0f}",
+            fg="green",
+        )
 
 
 @task.command("cancel")
@@ -104,27 +211,34 @@ def task_cancel(task):
 @with_appcontext
 @es_version_check
 @click.argument("task")
-@click.option("-n", "--interval", default=1, type=int, help="seconds to wait between updates")
-def task_watch(task, interval):
+@click.option(
+    "-n", "--interval", default=30, type=int, help="maximum seconds between two progress updates, 0 for the shortest"
+)
+@click.option("--json", "as_json", is_flag=True, default=False, help="stream the progress as JSON lines")
+def task_watch(task, interval, as_json):
     """Watch task info.
 
+    The progress of the reindex like tasks is displayed with the rate of
+    the last minute and the estimated remaining time. The task completion
+    is reported at once, the progress updates are more and more spaced out
+    up to `interval` seconds.
+
     :param task: task id.
+    :param interval: maximum seconds between two progress updates.
+    :param as_json: stream the progress as JSON lines.
     """
-    click.secho(f"Watching task: {task}", fg="green")
+    if not as_json:
+        click.secho(f"Watching task: {task}", fg="green")
     try:
-        seconds = 0
-        res = current_search_client.tasks.get(task)
-        while not res.get("completed"):
-            if info := res.get("task"):
-                click.secho(f"Watching task: {task} {seconds} seconds ...", fg="green")
+        progress = TaskProgress(task)
+        for _, res in TaskWaiter(current_search_client, [task], max_interval=interval):
+            if not as_json and not progress.samples and (info := res.get("task")):
                 click.secho(f"{info.get('description')}", fg="yellow")
-                click.secho(f"{pformat(info.get('status'))}", fg="yellow")
-            sleep(interval)
-            seconds += interval
-            res = current_search_client.tasks.get(task)
+            progress.update(res).echo(as_json)
 
-        click.secho(f"Finished task: {task} {seconds} seconds ...", fg="green")
-        click.secho(f"{pformat(res.get('response'))}", fg="green")
+        if not as_json:
+            click.secho(f"Finished task: {task} {format_duration(progress.elapsed)} ...", fg="green")
+            click.secho(f"{pformat(res.get('response'))}", fg="green")
     except Exception as err:
         click.secho(f"Error: {err}", fg="red")
         sys.exit(1)
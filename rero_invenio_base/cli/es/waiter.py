@@ -0,0 +1,124 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Elasticsearch tasks completion waiter."""
+
+from elasticsearch import ConnectionTimeout, TransportError
+
+
+def is_timeout(err):
+    """Check if a tasks API error is a wait for completion timeout.
+
+    :param err: the transport error.
+    :returns: True if the task is not completed in time.
+    """
+    return isinstance(err, ConnectionTimeout) or err.status_code == 408 or err.error == "timeout_exception"
+
+
+class TaskWaiter:
+    """Wait for the completion of several tasks.
+
+    Iterating over the waiter gives a `(task, response)` tuple for each tasks
+    API response until all the tasks are completed, the completed response of
+    a task being the last one. Between two rounds of status requests, the
+    oldest task is waited for with the `wait_for_completion` parameter
+    instead of sleeping: a completed task is then reported at once. The wait
+    timeout doubles up to `max_interval` while no task is completed and is
+    reset after each completion.
+
+    Tasks can be added during the iteration.
+
+    .. code-block:: python
+
+        waiter = TaskWaiter(current_search_client, [task1, task2])
+        for task, res in waiter:
+            if res.get('completed'):
+                waiter.add(next_task)
+    """
+
+    def __init__(self, client, tasks=(), max_interval=30, min_interval=0.5, factor=2):
+        """Init magic method.
+
+        :param client: the search client.
+        :param tasks: list - the ids of the tasks to wait for.
+        :param max_interval: number - maximum seconds between two rounds of
+            status requests, never less than `min_interval`.
+        :param min_interval: number - initial seconds between two rounds.
+        :param factor: number - backoff factor of the interval.
+        """
+        assert min_interval > 0
+        self.client = client
+        # a zero wait timeout would poll the tasks API in a tight loop
+        self.max_interval = max(max_interval, min_interval)
+        self.min_interval = min_interval
+        self.factor = factor
+        self.interval = self.min_interval
+        # insertion ordered set of the running tasks
+        self.tasks = dict.fromkeys(tasks)
+
+    def __len__(self):
+        """Get the number of running tasks."""
+        return len(self.tasks)
+
+    def add(self, task):
+        """Add a task to wait for.
+
+        :param task: the task id.
+        """
+        self.tasks[task] = None
+
+    def get(self, task, timeout=None):
+        """Get the status of a task.
+
+        :param task: the task id.
+        :param timeout: seconds to wait for the task completion, None to
+            return the status at once.
+        :returns: the tasks API response, None if the task is not completed
+            after the timeout.
+        """
+        if timeout is None:
+            return self.client.tasks.get(task)
+        try:
+            return self.client.tasks.get(
+                task,
+                wait_for_completion=True,
+                timeout=f"{int(timeout * 1000)}ms",
+                request_timeout=timeout + 30,
+            )
+        except TransportError as err:
+            if is_timeout(err):
+                return None
+            raise
+
+    def __iter__(self):
+        """Iterate over the tasks API responses."""
+        while self.tasks:
+            completed = False
+            for task in list(self.tasks):
+                res = self.get(task)
+                if res.get("completed"):
+                    del self.tasks[task]
+                    completed = True
+                yield task, res
+            if completed or not self.tasks:
+                self.interval = self.min_interval
+                continue
+            task = next(iter(self.tasks))
+            if (res := self.get(task, timeout=self.interval)) is None:
+                self.interval = min(self.interval * self.factor, self.max_interval)
+                continue
+            self.interval = self.min_interval
+            del self.tasks[task]
+            yield task, res
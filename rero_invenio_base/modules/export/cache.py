@@ -0,0 +1,196 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export results cache.
+
+The serialized export responses are stored in the cache while they are
+streamed. The cache key is built from the normalized search query, the
+response mimetype and the generation of the searched indices (sequence
+numbers and refresh counts of the primary shards): any indexing change
+produces a new key and the outdated entries are evicted over time.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from flask import current_app
+
+from .iterators import get_search_client
+
+
+def index_generation(search):
+    """Get the generation of the indices targeted by a search.
+
+    :param search: the search object.
+    :returns: a list describing the state of each primary shard.
+    """
+    client = get_search_client(search)
+    stats = client.indices.stats(index=search._index, metric="refresh", level="shards")
+    generation = []
+    for name, data in sorted(stats["indices"].items()):
+        for shard, copies in sorted(data["shards"].items()):
+            generation.extend(
+                [name, data.get("uuid"), shard, copy["seq_no"]["max_seq_no"], copy["refresh"]["total"]]
+                for copy in copies
+                if copy["routing"]["primary"]
+            )
+    return generation
+
+
+IGNORED_SEARCH_PARAMS = {"preference", "request_cache", "request_timeout", "timeout"}
+"""Search params not changing the search results."""
+
+
+def export_cache_key(search, mimetype):
+    """Build the cache key of an export.
+
+    The search params not changing the results, such as the per user
+    `preference`, are ignored to share the entries between the users.
+
+    :param search: the search object, including the user filters.
+    :param mimetype: string - the mimetype of the serialized response.
+    :returns: the cache key.
+    """
+    params = {name: value for name, value in search._params.items() if name not in IGNORED_SEARCH_PARAMS}
+    data = {
+        "query": search.to_dict(),
+        "params": params,
+        "mimetype": mimetype,
+        "generation": index_generation(search),
+    }
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class FileSystemExportCache:
+    """Export results cache stored on the local file system.
+
+    Each entry is stored in a file containing the response headers on the
+    first line followed by the response body. The least recently used
+    entries are evicted when the cache size exceeds ``max_size``.
+    """
+
+    suffix = ".export"
+    chunk_size = 64 * 1024
+    stored_headers = ("content-type", "content-disposition")
+    """Response headers stored with the entries, the other ones are specific
+    to a request (compression, cookies, ...)."""
+
+    def __init__(self, directory=None, max_size=None):
+        """Init magic method.
+
+        :param directory: string - the cache directory, default to
+            `RERO_INVENIO_BASE_EXPORT_CACHE_DIR` or `export_cache` in the
+            application instance path.
+        :param max_size: integer - the cache size in bytes, default to
+            `RERO_INVENIO_BASE_EXPORT_CACHE_MAX_SIZE`.
+        """
+        config = current_app.config
+        directory = directory or config.get("RERO_INVENIO_BASE_EXPORT_CACHE_DIR")
+        self.directory = Path(directory or Path(current_app.instance_path) / "export_cache")
+        self.max_size = max_size or config["RERO_INVENIO_BASE_EXPORT_CACHE_MAX_SIZE"]
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        """Get the file path of an entry."""
+        return self.directory / f"{key}{self.suffix}"
+
+    def get(self, key):
+        """Get a cached response.
+
+        :param key: string - the cache key.
+        :returns: a tuple with the response headers and an iterator over the
+            response body, or None if the key is not cached.
+        """
+        path = self._path(key)
+        try:
+            stream = path.open("rb")
+        except FileNotFoundError:
+            return None
+        # mark the entry as recently used, it can be evicted by another
+        # process once opened
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        headers = json.loads(stream.readline())
+
+        def read():
+            """Read the response body."""
+            with stream:
+                while chunk := stream.read(self.chunk_size):
+                    yield chunk
+
+        return headers, read()
+
+    def store(self, key, chunks, headers):
+        """Store a response while it is streamed.
+
+        The entry is only stored if all the chunks are consumed.
+
+        :param key: string - the cache key.
+        :param chunks: the iterator over the response body.
+        :param headers: the response headers, only the `stored_headers` are
+            kept.
+        :returns: an iterator over the response body.
+        """
+        # the headers are copied before the response is compressed or the
+        # session cookie is set
+        headers = [[name, value] for name, value in headers if name.lower() in self.stored_headers]
+        return self._store(key, chunks, headers)
+
+    def _store(self, key, chunks, headers):
+        """Write an entry while the response body is consumed."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        stored = False
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(json.dumps(headers).encode() + b"\n")
+                for chunk in chunks:
+                    if isinstance(chunk, str):
+                        chunk = chunk.encode()
+                    stream.write(chunk)
+                    yield chunk
+            os.replace(tmp_path, self._path(key))
+            stored = True
+            self.evict()
+        finally:
+            if not stored:
+                with contextlib.suppress(OSError):
+                    os.remove(tmp_path)
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    def evict(self):
+        """Remove the least recently used entries exceeding the cache size."""
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            with contextlib.suppress(FileNotFoundError):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            size -= entry_size
+
+    def clear(self):
+        """Remove all the cache entries."""
+        for path in self.directory.glob(f"*{self.suffix}"):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
@@ -0,0 +1,104 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export responses compression.
+
+The streamed export responses are compressed on the fly, chunk by chunk, so
+the response is still streamed and the memory used stays constant.
+"""
+
+import zlib
+
+from flask import current_app, request
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def gzip_compressor(level):
+    """Create a gzip compression object.
+
+    :param level: integer - the compression level (1-9).
+    :returns: an object with ``compress`` and ``flush`` methods.
+    """
+    return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+def zstd_compressor(level):
+    """Create a zstandard compression object.
+
+    :param level: integer - the compression level (1-22).
+    :returns: an object with ``compress`` and ``flush`` methods.
+    """
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+COMPRESSORS = {"gzip": gzip_compressor}
+"""Available compression objects factories by content encoding."""
+
+if zstandard:
+    COMPRESSORS["zstd"] = zstd_compressor
+
+
+def compress(chunks, compressor):
+    """Compress an iterator of chunks.
+
+    :param chunks: the iterable of string or bytes to compress.
+    :param compressor: the compression object.
+    :returns: an iterator over the compressed chunks.
+    """
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            # the compressor can buffer small chunks
+            if data := compressor.compress(chunk):
+                yield data
+        yield compressor.flush()
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+
+def negotiate_encoding():
+    """Get the best content encoding accepted by the client.
+
+    :returns: the content encoding or None if the response must not be
+        compressed.
+    """
+    encodings = [
+        encoding for encoding in current_app.config["RERO_INVENIO_BASE_EXPORT_COMPRESSION"] if encoding in COMPRESSORS
+    ]
+    return request.accept_encodings.best_match(encodings)
+
+
+def compress_response(response):
+    """Compress a response according to the request `Accept-Encoding`.
+
+    :param response: the response to compress.
+    :returns: the response, compressed if possible.
+    """
+    response.vary.add("Accept-Encoding")
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+    if not (encoding := negotiate_encoding()):
+        return response
+    level = current_app.config["RERO_INVENIO_BASE_EXPORT_COMPRESSION"][encoding]
+    response.response = compress(response.response, COMPRESSORS[encoding](level))
+    response.headers["Content-Encoding"] = encoding
+    response.headers.pop("Content-Length", None)
+    return response
@@ -50,10 +50,130 @@ RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS = dict(
 :param search_serializers: It contains the list of records serializers for all
     supported format. This configuration differ from the previous because in
     this case it handle a list of records resulted by a search query instead of
-    a single record.
+    a single record. The serializers given as import paths are only imported
+    on the first request for their mimetype. Built-in NDJSON, Arrow IPC and
+    Parquet serializers are available in `rero_invenio_base.modules.export.
+    formats`.
+
+:param search_iterator_imp: Import path (or callable) of the function used
+    to iterate over all the search hits (see `rero_invenio_base.modules.export.
+    iterators`). Default to `iterators:scan` using a single scroll cursor ;
+    `iterators:sliced_scan` scrolls several slices concurrently and
+    `iterators:point_in_time_scan` uses a point in time with `search_after`
+    instead of a scroll context.
+
+:param search_iterator_options: Keyword arguments given to the search
+    iterator, i.e.: `dict(slices=4, buffer_size=200)` for the sliced scan.
+
+:param search_batch_size: Number of hits per batch given to the
+    serializers. Serializers can then process a batch of hits at once (see
+    `serializers.BatchSerializerMixin`), i.e. to resolve the linked records
+    with one query per batch. Disabled by default.
+
+:param search_source_includes: List of the source fields retrieved from
+    the search cluster, i.e. `['pid', 'title', 'patron.pid']`. If not given,
+    the `source_includes` attribute of the serializer is used if any,
+    otherwise the full source is retrieved.
+
+:param export_cache: Store the serialized exports in the export cache and
+    serve the identical requests from it while the searched indices did not
+    change (see `cache.py`). The exports content must only depend on the search
+    query. Ignored if `continuation_checkpoint` is set. Default to False.
+
+:param export_jobs: Enable the asynchronous export jobs (see `jobs.py`). A
+    `POST` on `/export/{list_route}jobs/` with the export query args sends the
+    export to the celery workers and returns the job status url. The status
+    gives the export progress and the download url once the job is done.
+    Default to False.
+
+:param max_concurrent_exports: Maximum number of concurrent exports of this
+    endpoint, per web server process or for all the processes depending on
+    the limiter (see `limiter.py`). No limit by default.
+
+:param continuation_checkpoint: Number of emitted hits between two
+    continuation tokens (see `continuation.py`). The tokens are attached to
+    the hits as `hit.meta.continuation`, written in the stream by the
+    built-in NDJSON and Arrow IPC formats (see `formats.py`), and an export
+    can be resumed giving the last token as query arg. The search iterator
+    must support `search_after` (i.e. `iterators:point_in_time_scan`).
+    Disabled by default.
 
 :param search_serializers_aliases: A mapping of values of the defined query arg
     (see `config.REST_MIMETYPE_QUERY_ARG_NAME`) to valid mimetypes for records
     search serializers: dict(alias -> mimetype).
 
 """
+
+RERO_INVENIO_BASE_EXPORT_CONTINUATION_ARG_NAME = "continuation"
+"""Query arg name used to give a continuation token to an export endpoint."""
+
+RERO_INVENIO_BASE_EXPORT_CONTINUATION_MAX_AGE = 24 * 60 * 60
+"""Validity of the export continuation tokens in seconds."""
+
+RERO_INVENIO_BASE_EXPORT_COMPRESSION = {"gzip": 6, "zstd": 3}
+"""Content encodings used to compress the export responses on the fly.
+
+A mapping of content encoding to compression level, ordered by preference
+when several encodings are accepted by the client. `zstd` requires the
+`zstandard` package. Use an empty dict to disable the compression.
+"""
+
+RERO_INVENIO_BASE_EXPORT_CACHE_IMP = "rero_invenio_base.modules.export.cache:FileSystemExportCache"
+"""Export results cache class."""
+
+RERO_INVENIO_BASE_EXPORT_CACHE_DIR = None
+"""Directory of the file system export cache, default to the instance path."""
+
+RERO_INVENIO_BASE_EXPORT_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+"""Maximum size of the file system export cache in bytes."""
+
+RERO_INVENIO_BASE_EXPORT_JOBS_DIR = None
+"""Directory of the export jobs files, default to the instance path.
+
+It must be shared between the web servers and the celery workers.
+"""
+
+RERO_INVENIO_BASE_EXPORT_JOBS_MAX_AGE = 7 * 24 * 60 * 60
+"""Export jobs retention in seconds, see the `clean_export_jobs` task."""
+
+RERO_INVENIO_BASE_EXPORT_LIMITER_IMP = "rero_invenio_base.modules.export.limiter:ExportLimiter"
+"""Export concurrency limiter class.
+
+The default limiter counts the exports of each process and can not limit
+the exports of the single-threaded multi-process servers (i.e. gunicorn sync
+workers), an error is then logged on the first export.
+`limiter:RedisExportLimiter` shares the limits between all the processes.
+"""
+
+RERO_INVENIO_BASE_EXPORT_LIMITER_REDIS_URL = None
+"""Redis url of the shared export limiter, default to `CACHE_REDIS_URL`."""
+
+RERO_INVENIO_BASE_EXPORT_LIMITER_LEASE = 6 * 60 * 60
+"""Seconds after which a slot of the shared export limiter is freed.
+
+It frees the slots of the killed processes, an export running longer is no
+longer counted.
+"""
+
+RERO_INVENIO_BASE_EXPORT_MAX_CONCURRENT = None
+"""Maximum number of concurrent exports.
+
+All the export endpoints are counted, per web server process or for all the
+processes depending on the limiter. None for no limit.
+"""
+
+RERO_INVENIO_BASE_EXPORT_QUEUE_TIMEOUT = 0
+"""Seconds to wait for a free export slot before rejecting the request."""
+
+RERO_INVENIO_BASE_EXPORT_RETRY_AFTER = 30
+"""Seconds given in the `Retry-After` header of rejected export requests."""
+
+RERO_INVENIO_BASE_EXPORT_METRICS_HANDLERS = []
+"""Receivers of the `export_finished` signal for the application.
+
+List of import paths of functions called with the application and the export
+measures, i.e.:
+- `rero_invenio_base.modules.export.metrics:log_metrics` logs the measures.
+- `rero_invenio_base.modules.export.metrics:prometheus_metrics` records them
+  in the Prometheus default registry (requires `prometheus_client`).
+"""
@@ -0,0 +1,101 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export continuation tokens.
+
+A continuation token is a signed value containing the sort values of the last
+hit emitted by an export and a fingerprint of the export query. Giving this
+token back to the same export endpoint with the same query resumes the export
+after this hit instead of restarting it from the first document.
+"""
+
+import hashlib
+
+from flask import current_app, request
+from itsdangerous import BadData, URLSafeTimedSerializer
+from werkzeug.exceptions import BadRequest
+
+
+class ExportContinuation:
+    """Signed continuation tokens of an export request."""
+
+    salt = "rero-invenio-base-export-continuation"
+
+    def __init__(self, fingerprint, secret_key, max_age=None):
+        """Init magic method.
+
+        :param fingerprint: string - the export query fingerprint.
+        :param secret_key: string - the key used to sign the tokens.
+        :param max_age: integer - the token validity in seconds.
+        """
+        self.fingerprint = fingerprint
+        self.max_age = max_age
+        self.serializer = URLSafeTimedSerializer(secret_key, salt=self.salt)
+
+    @classmethod
+    def from_request(cls):
+        """Build the continuation tokens for the current export request."""
+        arg_name = current_app.config["RERO_INVENIO_BASE_EXPORT_CONTINUATION_ARG_NAME"]
+        args = sorted((key, value) for key, value in request.args.items(multi=True) if key != arg_name)
+        fingerprint = hashlib.sha1(repr((request.endpoint, args)).encode(), usedforsecurity=False).hexdigest()
+        return cls(
+            fingerprint,
+            current_app.config["SECRET_KEY"],
+            current_app.config["RERO_INVENIO_BASE_EXPORT_CONTINUATION_MAX_AGE"],
+        )
+
+    def dumps(self, sort):
+        """Create a continuation token.
+
+        :param sort: list - the sort values of the last emitted hit.
+        :returns: the signed token.
+        """
+        return self.serializer.dumps({"f": self.fingerprint, "s": list(sort)})
+
+    def loads(self, token):
+        """Get the sort values of a continuation token.
+
+        :param token: string - the signed token.
+        :returns: the sort values to resume the export after.
+        :raises BadRequest: if the token is invalid, expired or has been
+            created for another export query.
+        """
+        try:
+            data = self.serializer.loads(token, max_age=self.max_age)
+        except BadData as err:
+            raise BadRequest("Invalid or expired continuation token.") from err
+        if data.get("f") != self.fingerprint:
+            raise BadRequest("The continuation token does not match the export query.")
+        return data["s"]
+
+    def checkpoints(self, hits, every):
+        """Attach continuation tokens to the hits at regular intervals.
+
+        Every ``every`` hits, the token allowing to resume the export after
+        the current hit is set as ``hit.meta.continuation``. Stream serializers
+        write it once the hit is emitted (see `formats.py`).
+
+        :param hits: the hits iterator, hits must have sort values.
+        :param every: integer - the number of hits between two tokens.
+        :returns: an iterator over the hits.
+        """
+        try:
+            for count, hit in enumerate(hits, 1):
+                if not count % every and (sort := getattr(hit.meta, "sort", None)):
+                    hit.meta.continuation = self.dumps(sort)
+                yield hit
+        finally:
+            if hasattr(hits, "close"):
+                hits.close()
@@ -16,6 +16,14 @@
 
 """RERO Invenio base module declaration for streamed exports."""
 
+from functools import cached_property
+
+from flask import current_app
+from invenio_records_rest.utils import obj_or_import_string
+
+from . import config
+from .signals import export_finished
+
 
 class ReroInvenioBaseExportApp:
     """RERO Invenio base export app."""
@@ -29,10 +37,24 @@ class ReroInvenioBaseExportApp:
     def init_app(self, app):
         """Flask application initialization."""
         self.init_config(app)
+        for handler in app.config["RERO_INVENIO_BASE_EXPORT_METRICS_HANDLERS"]:
+            export_finished.connect(obj_or_import_string(handler), sender=app, weak=False)
         app.extensions["rero_invenio_base_exports"] = self
 
     def init_config(self, app):
         """Initialize configuration."""
-        for k in dir(app.config):
+        for k in dir(config):
             if k.startswith("RERO_INVENIO_BASE_EXPORT"):
-                app.config.setdefault(k, getattr(app.config, k))
+                app.config.setdefault(k, getattr(config, k))
+
+    @cached_property
+    def cache(self):
+        """Export results cache."""
+        cache_class = obj_or_import_string(current_app.config["RERO_INVENIO_BASE_EXPORT_CACHE_IMP"])
+        return cache_class()
+
+    @cached_property
+    def limiter(self):
+        """Export concurrency limiter."""
+        limiter_class = obj_or_import_string(current_app.config["RERO_INVENIO_BASE_EXPORT_LIMITER_IMP"])
+        return limiter_class()
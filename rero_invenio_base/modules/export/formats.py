@@ -0,0 +1,296 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base built-in export formats.
+
+The serializers encode the hits source by batches. The NDJSON one can be
+used directly in the export endpoints configuration:
+
+.. code-block:: python
+
+    search_serializers={
+        'application/x-ndjson':
+            'rero_invenio_base.modules.export.formats:ndjson_stream_search',
+    }
+
+A field projection can be given to build dedicated serializers, the fields
+are then the only ones requested to the search cluster. The columnar formats
+need the exported fields or their schema to write the file header, without
+schema all the columns are strings:
+
+.. code-block:: python
+
+    stream_search_responsify(
+        ArrowSerializer(fields=['pid', 'title', 'provisionActivity.startDate']),
+        'application/vnd.apache.arrow.stream'
+    )
+
+The NDJSON serializer uses `orjson` if it is installed. The Arrow IPC and
+Parquet serializers require `pyarrow`. These optional dependencies are
+installed with the `export` extra.
+
+If continuation tokens are enabled for the export endpoint, the NDJSON
+serializer writes each token as a control record ``{"_continuation": token}``
+after the hit it belongs to, and the Arrow IPC serializer as the
+``_continuation`` custom metadata of the record batch ending with this hit.
+Giving the last received token back to the endpoint resumes the export after
+the last received hit. A Parquet file is not readable before its end, thus it
+has no token.
+"""
+
+import json
+
+from .serializers import BatchSerializerMixin, stream_search_responsify
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+CONTINUATION_KEY = "_continuation"
+"""Name of the continuation tokens in the exported streams."""
+
+
+def hit_source(hit):
+    """Get the source of a search hit.
+
+    :param hit: the search hit.
+    :returns: the hit source dict.
+    """
+    return hit.to_dict() if hasattr(hit, "to_dict") else hit
+
+
+def hit_continuation(hit):
+    """Get the continuation token attached to a search hit.
+
+    :param hit: the search hit.
+    :returns: the token or None if the hit is not a checkpoint.
+    """
+    return getattr(getattr(hit, "meta", None), "continuation", None)
+
+
+def field_value(source, field):
+    """Get the value of a field.
+
+    :param source: dict - the hit source.
+    :param field: string - the field path, with dots for the nested fields.
+    :returns: the field value or None if the field does not exist.
+    """
+    value = source
+    for key in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def dumps_json(data):
+    """Encode data in compact JSON.
+
+    :param data: the data to encode.
+    :returns: the JSON bytes.
+    """
+    if orjson:
+        return orjson.dumps(data, default=str)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+
+
+def string_value(value):
+    """Encode a value as string.
+
+    :param value: the field value.
+    :returns: the string itself, None or the JSON encoded value.
+    """
+    if value is None or isinstance(value, str):
+        return value
+    return dumps_json(value).decode()
+
+
+class NDJSONSerializer(BatchSerializerMixin):
+    """Newline delimited JSON serializer, one hit source per line."""
+
+    def __init__(self, fields=None, batch_size=1000):
+        """Init magic method.
+
+        :param fields: list - the exported fields, all the fields by default.
+        :param batch_size: integer - the number of hits encoded at once.
+        """
+        self.fields = fields
+        self.source_includes = fields
+        self.batch_size = batch_size
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Serialize a batch of hits.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param hits: tuple - the hits of the batch.
+        :returns: the serialized batch as bytes.
+        """
+        lines = []
+        for hit in hits:
+            source = hit_source(hit)
+            if self.fields:
+                source = {field: field_value(source, field) for field in self.fields}
+            lines.append(dumps_json(source) + b"\n")
+            if token := hit_continuation(hit):
+                lines.append(dumps_json({CONTINUATION_KEY: token}) + b"\n")
+        return b"".join(lines)
+
+
+class _StreamSink:
+    """Writable file-like object buffering the written bytes.
+
+    The position is kept while the buffer is drained, as the Arrow writers
+    need it to build the file metadata.
+    """
+
+    closed = False
+
+    def __init__(self):
+        """Init magic method."""
+        self.chunks = []
+        self.position = 0
+
+    def write(self, data):
+        """Buffer data."""
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        """Get the position in the stream."""
+        return self.position
+
+    def flush(self):
+        """Nothing to flush."""
+
+    def close(self):
+        """Mark the sink as closed."""
+        self.closed = True
+
+    def drain(self):
+        """Get and remove the buffered bytes."""
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ArrowSerializer(BatchSerializerMixin):
+    """Columnar serializer writing a record batch per batch of hits.
+
+    The columns are the given fields (nested fields are named by their path)
+    or the fields of the given schema. The schema is written before the
+    first batch: without a given schema, all the columns are strings and the
+    values which are not strings are encoded in JSON.
+    """
+
+    def __init__(self, fields=None, schema=None, batch_size=10000, file_format="ipc"):
+        """Init magic method.
+
+        :param fields: list - the exported fields, the schema fields by
+            default.
+        :param schema: the `pyarrow.Schema` of the exported fields, string
+            columns by default.
+        :param batch_size: integer - the number of hits per record batch.
+        :param file_format: string - `ipc` for the Arrow IPC stream format,
+            `parquet` for a Parquet file with a row group per batch.
+        """
+        assert file_format in ["ipc", "parquet"]
+        # the header written before the first batch must contain all the
+        # columns of the export
+        assert fields or schema, "The exported fields or their schema are required."
+        fields = fields or schema.names
+        self.fields = fields
+        self.source_includes = fields
+        self.stringify = schema is None
+        self.schema = schema or pyarrow.schema([(field, pyarrow.large_string()) for field in fields])
+        self.batch_size = batch_size
+        self.file_format = file_format
+
+    def _writer(self, sink, schema):
+        """Create the file writer."""
+        if self.file_format == "parquet":
+            return pyarrow.parquet.ParquetWriter(sink, schema)
+        return pyarrow.ipc.new_stream(sink, schema)
+
+    def serialize_search(self, pid_fetcher, search_result, **kwargs):
+        """Serialize a search result.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param search_result: the hits iterator.
+        :returns: an iterator over the file chunks.
+        """
+        sink = _StreamSink()
+        # no hits: the file contains only the schema
+        writer = self._writer(sink, self.schema)
+        for rows, token in self._segments(pid_fetcher, search_result):
+            batch = pyarrow.RecordBatch.from_pylist(rows, schema=self.schema)
+            if self.file_format == "parquet":
+                writer.write_table(pyarrow.Table.from_batches([batch]))
+            elif token:
+                writer.write_batch(batch, custom_metadata={CONTINUATION_KEY: token})
+            else:
+                writer.write_batch(batch)
+            if data := sink.drain():
+                yield data
+        writer.close()
+        yield sink.drain()
+
+    def _segments(self, pid_fetcher, search_result):
+        """Get the rows of the search result by record batch.
+
+        A batch of hits containing a continuation token is split after the
+        last hit with a token, so the record batch ends with this hit.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param search_result: the hits iterator.
+        :returns: an iterator over (rows, token) tuples.
+        """
+        for hits in self.batches(search_result):
+            rows = self.serialize_batch(pid_fetcher, hits)
+            tokens = [(index, token) for index, hit in enumerate(hits) if (token := hit_continuation(hit))]
+            if not tokens or self.file_format == "parquet":
+                yield rows, None
+                continue
+            index, token = tokens[-1]
+            yield rows[: index + 1], token
+            if rows[index + 1 :]:
+                yield rows[index + 1 :], None
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Get the rows of a batch of hits.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param hits: tuple - the hits of the batch.
+        :returns: the list of rows.
+        """
+        sources = (hit_source(hit) for hit in hits)
+        rows = [{field: field_value(source, field) for field in self.fields} for source in sources]
+        if self.stringify:
+            return [{field: string_value(value) for field, value in row.items()} for row in rows]
+        return rows
+
+
+ndjson_stream_search = stream_search_responsify(NDJSONSerializer(), "application/x-ndjson")
+"""Streamed NDJSON response for all the hits fields."""
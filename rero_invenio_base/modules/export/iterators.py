@@ -0,0 +1,240 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export search iterators.
+
+An export search iterator is a callable receiving the prepared search and
+returning an iterator over all the matching hits. The iterator used by an
+export endpoint is configured using the ``search_iterator_imp`` and
+``search_iterator_options`` keys of the endpoint configuration.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from queue import Full, Queue
+from threading import Event
+
+from elasticsearch_dsl.connections import get_connection
+from flask import current_app
+
+from ..utils import chunk
+
+_SLICE_DONE = object()
+"""Marker pushed in the hits queue when a slice is fully consumed."""
+
+
+def scan(search):
+    """Iterate over all search hits using a single scroll cursor.
+
+    The scroll is cleared as soon as the iterator is closed, including when
+    the client disconnects before the end of the export.
+
+    :param search: the search to iterate.
+    :returns: an iterator over all the search hits.
+    """
+    # the scroll is cleared outside of the application context
+    return search.using(get_search_client(search)).scan()
+
+
+class BatchedHits:
+    """Hits iterator grouping the hits in fixed-size batches.
+
+    Iterating over it yields the hits one by one, so any serializer can use
+    it. Serializers supporting batches (see
+    `serializers.BatchSerializerMixin`) use ``batches()`` to process a page of
+    hits at once, i.e. to resolve linked records with a single query.
+    """
+
+    def __init__(self, hits, size):
+        """Init magic method.
+
+        :param hits: the hits iterator.
+        :param size: integer - the number of hits per batch.
+        """
+        self.hits = hits
+        self.size = size
+
+    def __iter__(self):
+        """Iterate over the hits."""
+        for batch in self.batches():
+            yield from batch
+
+    def batches(self):
+        """Iterate over the batches of hits.
+
+        :returns: an iterator over tuples of hits.
+        """
+        return chunk(self.hits, self.size)
+
+    def close(self):
+        """Close the underlying hits iterator."""
+        if hasattr(self.hits, "close"):
+            self.hits.close()
+
+
+def get_search_client(search):
+    """Get the search client of a search object.
+
+    The client proxy is resolved to allow its use outside of the application
+    context, i.e. when a streamed response is closed by the WSGI server.
+    """
+    client = get_connection(search._using)
+    if hasattr(client, "_get_current_object"):
+        client = client._get_current_object()
+    return client
+
+
+def close_hits(hits, logger):
+    """Close a hits iterator and release its search context.
+
+    The errors are logged: failing to release a search context (i.e. the
+    search cluster is not reachable) must not prevent to release the other
+    resources of the export.
+
+    :param hits: the hits iterator.
+    :param logger: the logger of the application.
+    """
+    try:
+        hits.close()
+    except Exception as error:
+        logger.warning(f"Export search context not released: {error}")
+
+
+def _sort_fields(sort):
+    """Get the field names of a search sort definition."""
+    return [next(iter(key)) if isinstance(key, dict) else key.lstrip("-") for key in sort]
+
+
+def sliced_scan(search, slices=2, max_workers=None, buffer_size=100, timeout=0.1):
+    """Iterate over all search hits using concurrent sliced scrolls.
+
+    Each slice is scrolled by a thread of a bounded pool and pushes its hits
+    into a shared queue. The queue is bounded to ``buffer_size`` hits per
+    slice, so the memory used does not depend on the search result size.
+    Hits are yielded in the order they are received: the global sort order
+    of the search is not preserved.
+
+    :param search: the search to iterate.
+    :param slices: integer - the number of slices to open.
+    :param max_workers: integer - the maximum number of slices scrolled at
+        the same time, default to ``slices``.
+    :param buffer_size: integer - the buffer depth of each slice.
+    :param timeout: float - seconds to wait before a worker checks again if
+        the iteration has been stopped.
+    :returns: an iterator over all the search hits.
+    """
+    if slices < 2:
+        return scan(search)
+    # the threads use the current application to query the search cluster.
+    app = current_app._get_current_object()
+    hits = Queue(maxsize=slices * buffer_size)
+    stopped = Event()
+
+    def push(item):
+        """Push an item in the queue unless the iteration is stopped."""
+        while not stopped.is_set():
+            with suppress(Full):
+                hits.put(item, timeout=timeout)
+                return True
+        return False
+
+    def scroll(slice_id):
+        """Scroll a slice of the search."""
+        with app.app_context():
+            cursor = search.extra(slice={"id": slice_id, "max": slices}).scan()
+            try:
+                for hit in cursor:
+                    if not push(hit):
+                        break
+            except Exception as err:
+                push(err)
+            finally:
+                # closing the cursor clears the scroll context
+                cursor.close()
+                push(_SLICE_DONE)
+
+    def merge():
+        """Merge the hits of all the slices."""
+        executor = ThreadPoolExecutor(max_workers=max_workers or slices, thread_name_prefix="export-slice")
+        try:
+            for slice_id in range(slices):
+                executor.submit(scroll, slice_id)
+            running = slices
+            while running:
+                item = hits.get()
+                if item is _SLICE_DONE:
+                    running -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return merge()
+
+
+def point_in_time_scan(search, size=1000, keep_alive="1m", pid_field="pid", search_after=None):
+    """Iterate over all search hits using a point in time and `search_after`.
+
+    Contrary to a scroll, a point in time does not hold a search context per
+    shard on the data nodes. The hits are retrieved by pages sorted on the
+    search sort, the ``pid_field`` and ``_shard_doc`` (Elasticsearch >= 7.12)
+    to get a stable total order. The sort values of each hit are available
+    using ``hit.meta.sort`` and can be given as ``search_after`` to resume the
+    iteration after this hit.
+
+    The point in time is closed at the end of the iteration, including when
+    the iterator is closed before the end.
+
+    :param search: the search to iterate.
+    :param size: integer - the number of hits retrieved per page.
+    :param keep_alive: string - the point in time validity between two pages.
+    :param pid_field: string - the unique field used to sort the hits.
+    :param search_after: list - the sort values of the last hit already
+        retrieved.
+    :returns: an iterator over all the search hits.
+    """
+    client = get_search_client(search)
+    sort = list(search._sort)
+    if pid_field not in _sort_fields(sort):
+        sort.append(pid_field)
+    sort.append("_shard_doc")
+    # indices and preference can not be used with a point in time
+    page = search.index().params(preference=None).sort(*sort).extra(size=size, track_total_hits=False)
+    # the total and the aggregations would be computed again for each page
+    page.aggs._params = {"aggs": {}}
+
+    def iterate():
+        """Iterate over the search pages."""
+        pit_id = client.open_point_in_time(index=search._index, keep_alive=keep_alive)["id"]
+        after = search_after
+        try:
+            while True:
+                current = page.extra(pit={"id": pit_id, "keep_alive": keep_alive})
+                if after:
+                    current = current.extra(search_after=list(after))
+                response = current.execute()
+                # the point in time id can change between two requests
+                pit_id = getattr(response, "pit_id", pit_id)
+                yield from response.hits
+                if len(response.hits) < size:
+                    break
+                after = response.hits[-1].meta.sort
+        finally:
+            client.close_point_in_time(body={"id": pit_id})
+
+    return iterate()
@@ -0,0 +1,211 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base asynchronous export jobs.
+
+An export job runs an export in a celery worker and writes the result into
+a file. The job status and the result are stored in the jobs directory,
+which must be shared by the web and the celery workers.
+
+A job belongs to the user who created it: only this user can get its status
+and result, and the export runs with the permissions of this user.
+"""
+
+import contextlib
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+from flask import current_app
+
+try:
+    from flask_login import current_user
+    from flask_security import login_user
+    from invenio_accounts.proxies import current_datastore
+except ImportError:
+    current_user = login_user = current_datastore = None
+
+
+def current_user_id():
+    """Get the id of the current user.
+
+    :returns: the user id or None for the anonymous users.
+    """
+    if current_user is None or not hasattr(current_app, "login_manager"):
+        return None
+    return current_user.get_id() if current_user.is_authenticated else None
+
+
+def login_job_owner(user_id):
+    """Log in the owner of a job in the current request context.
+
+    :param user_id: string - the user id.
+    """
+    user = current_datastore.get_user(user_id) if current_datastore else None
+    if user is None:
+        raise ValueError(f"Export job owner {user_id} does not exist.")
+    login_user(user)
+
+
+class ExportJob:
+    """Asynchronous export job."""
+
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    SUCCESS = "SUCCESS"
+    FAILURE = "FAILURE"
+
+    def __init__(self, job_id):
+        """Init magic method.
+
+        :param job_id: string - the job identifier.
+        """
+        self.id = str(uuid.UUID(job_id))
+        self.directory = self.jobs_directory()
+
+    @classmethod
+    def jobs_directory(cls):
+        """Get the jobs directory."""
+        directory = current_app.config.get("RERO_INVENIO_BASE_EXPORT_JOBS_DIR")
+        directory = Path(directory or Path(current_app.instance_path) / "export_jobs")
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    @classmethod
+    def create(cls, endpoint, query_string, mimetype):
+        """Create a new export job and send it to the celery workers.
+
+        The job belongs to the current user.
+
+        :param endpoint: string - the export endpoint name.
+        :param query_string: string - the export query string.
+        :param mimetype: string - the mimetype of the export.
+        :returns: the created job.
+        """
+        # the task module depends on the views, which depend on this module
+        from .tasks import export_job
+
+        job = cls(str(uuid.uuid4()))
+        job.update(
+            owner=current_user_id(), endpoint=endpoint, mimetype=mimetype, state=cls.PENDING, documents=0, total=None
+        )
+        export_job.delay(job.id, endpoint, query_string, mimetype)
+        return job
+
+    @property
+    def status_path(self):
+        """Path of the job status file."""
+        return self.directory / f"{self.id}.json"
+
+    @property
+    def path(self):
+        """Path of the job result file."""
+        return self.directory / f"{self.id}.export"
+
+    @property
+    def status(self):
+        """Get the job status.
+
+        :returns: the job status dict or None if the job does not exist.
+        """
+        try:
+            return json.loads(self.status_path.read_text())
+        except FileNotFoundError:
+            return None
+
+    def update(self, **data):
+        """Update the job status.
+
+        :param data: the job status values to update.
+        """
+        status = {**(self.status or {}), **data, "updated": time.time()}
+        tmp_path = self.status_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(status))
+        os.replace(tmp_path, self.status_path)
+
+    @property
+    def owner(self):
+        """Id of the user who created the job, None for the anonymous users."""
+        return (self.status or {}).get("owner")
+
+    def run(self, resource, progress_interval=1000):
+        """Run the export and write the result into the job file.
+
+        Must be called in the context of the export request, with the job
+        owner logged in.
+
+        :param resource: the export resource.
+        :param progress_interval: integer - the number of exported documents
+            between two status updates.
+        """
+        self.update(state=self.RUNNING)
+        tmp_path = self.path.with_suffix(".export.tmp")
+        search_iterator = resource.search_iterator
+
+        def track_progress(search, **kwargs):
+            """Iterate over the hits and update the job progress."""
+            self.update(total=search.count())
+            hits = search_iterator(search, **kwargs)
+            count = 0
+            try:
+                for hit in hits:
+                    count += 1
+                    if not count % progress_interval:
+                        self.update(documents=count)
+                    yield hit
+                self.update(documents=count)
+            finally:
+                if hasattr(hits, "close"):
+                    hits.close()
+
+        resource.search_iterator = track_progress
+        try:
+            response = resource.export()
+            with tmp_path.open("wb") as stream:
+                for chunk in response.iter_encoded():
+                    stream.write(chunk)
+            response.close()
+            os.replace(tmp_path, self.path)
+            self.update(state=self.SUCCESS)
+        except Exception as err:
+            current_app.logger.error(f"Export job {self.id} failed: {err}")
+            self.update(state=self.FAILURE, error=str(err))
+            with contextlib.suppress(FileNotFoundError):
+                tmp_path.unlink()
+            raise
+
+    def delete(self):
+        """Delete the job status and result files."""
+        for path in (self.status_path, self.path):
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+    @classmethod
+    def clean(cls, max_age):
+        """Delete the jobs not updated since a given time.
+
+        :param max_age: integer - the jobs maximum age in seconds.
+        :returns: the number of deleted jobs.
+        """
+        deleted = 0
+        limit = time.time() - max_age
+        for path in cls.jobs_directory().glob("*.json"):
+            job = cls(path.stem)
+            if (job.status or {}).get("updated", 0) < limit:
+                job.delete()
+                deleted += 1
+        return deleted
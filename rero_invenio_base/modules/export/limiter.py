@@ -0,0 +1,211 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export concurrency limiter.
+
+`ExportLimiter` counts the exports of the current process: it only works if
+each process serves several requests at once (threaded workers). With
+single-threaded processes (i.e. gunicorn sync or uwsgi workers), the limits
+must be shared by all the processes using `RedisExportLimiter`:
+
+.. code-block:: python
+
+    RERO_INVENIO_BASE_EXPORT_LIMITER_IMP = (
+        'rero_invenio_base.modules.export.limiter:RedisExportLimiter'
+    )
+"""
+
+import time
+import uuid
+from collections import Counter
+from threading import Condition
+
+from flask import current_app, has_request_context, request
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+
+class ExportLimiter:
+    """Limit the number of concurrent exports of the current process.
+
+    The limits apply to each web server process: with several processes,
+    the cluster wide limit is the process limit multiplied by the number of
+    processes. The exports aborted by the client are counted by endpoint.
+    """
+
+    def __init__(self):
+        """Init magic method."""
+        self.condition = Condition()
+        self.running = Counter()
+        self.aborted = Counter()
+        self.server_checked = False
+
+    def check_server(self, limit, global_limit):
+        """Check once that the limits can be enforced by the web server.
+
+        An error is logged if the limits are set and the server runs
+        single-threaded processes, which never run two exports at once: the
+        exports are then not limited.
+
+        :param limit: integer - the endpoint limit or None.
+        :param global_limit: integer - the global limit or None.
+        """
+        if self.server_checked or (limit is None and global_limit is None) or not has_request_context():
+            return
+        self.server_checked = True
+        environ = request.environ
+        if environ.get("wsgi.multiprocess") and not environ.get("wsgi.multithread"):
+            current_app.logger.error(
+                f"{type(self).__name__} counts the exports of one process and can not limit the exports of a"
+                " multi-process server, use RedisExportLimiter."
+            )
+
+    def acquire(self, key, limit=None, global_limit=None, timeout=0):
+        """Acquire an export slot.
+
+        :param key: string - the export endpoint key.
+        :param limit: integer - the maximum number of concurrent exports for
+            this endpoint, None for no limit.
+        :param global_limit: integer - the maximum number of concurrent
+            exports for all the endpoints, None for no limit.
+        :param timeout: float - seconds to wait for a free slot.
+        :returns: the slot to release, None if no slot is available.
+        """
+        self.check_server(limit, global_limit)
+
+        def available():
+            """Check if a slot is available."""
+            if global_limit is not None and sum(self.running.values()) >= global_limit:
+                return False
+            return limit is None or self.running[key] < limit
+
+        with self.condition:
+            if not self.condition.wait_for(available, timeout=timeout):
+                return None
+            self.running[key] += 1
+            return key
+
+    def release(self, key, slot=None, aborted=False):
+        """Release an export slot.
+
+        :param key: string - the export endpoint key.
+        :param slot: the slot returned by `acquire`.
+        :param aborted: boolean - the export has been aborted by the client.
+        """
+        with self.condition:
+            self.running[key] -= 1
+            if aborted:
+                self.aborted[key] += 1
+            self.condition.notify_all()
+
+
+class RedisExportLimiter(ExportLimiter):
+    """Limit the number of concurrent exports of all the processes.
+
+    The running exports are stored in Redis sorted sets, one per endpoint and
+    one for all the endpoints, scored by their expiration time: the slots of
+    a killed process are freed after `RERO_INVENIO_BASE_EXPORT_LIMITER_LEASE`
+    seconds. The `running` and `aborted` counters are the ones of the current
+    process.
+    """
+
+    prefix = "rero-invenio-base:exports"
+    poll_interval = 0.2
+
+    # check the limits and add the slot atomically
+    script = """
+        local now, expires, limit, global_limit, slot = unpack(ARGV)
+        for _, name in ipairs(KEYS) do
+            redis.call('ZREMRANGEBYSCORE', name, '-inf', now)
+        end
+        if tonumber(global_limit) >= 0 and redis.call('ZCARD', KEYS[2]) >= tonumber(global_limit) then
+            return 0
+        end
+        if tonumber(limit) >= 0 and redis.call('ZCARD', KEYS[1]) >= tonumber(limit) then
+            return 0
+        end
+        for _, name in ipairs(KEYS) do
+            redis.call('ZADD', name, expires, slot)
+        end
+        return 1
+    """
+
+    def __init__(self, url=None, lease=None):
+        """Init magic method.
+
+        :param url: string - the Redis url, default to
+            `RERO_INVENIO_BASE_EXPORT_LIMITER_REDIS_URL` or `CACHE_REDIS_URL`.
+        :param lease: integer - seconds after which a slot is freed, default
+            to `RERO_INVENIO_BASE_EXPORT_LIMITER_LEASE`.
+        """
+        super().__init__()
+        config = current_app.config
+        url = url or (
+            config.get("RERO_INVENIO_BASE_EXPORT_LIMITER_REDIS_URL")
+            or config.get("CACHE_REDIS_URL", "redis://localhost:6379/0")
+        )
+        self.lease = lease or config["RERO_INVENIO_BASE_EXPORT_LIMITER_LEASE"]
+        self.client = redis.Redis.from_url(url)
+        self.try_acquire = self.client.register_script(self.script)
+
+    def _keys(self, key):
+        """Get the Redis keys of an endpoint slots and of all the slots."""
+        return [f"{self.prefix}:{key}", f"{self.prefix}:all"]
+
+    def check_server(self, limit, global_limit):
+        """Accept any web server, the limits are shared by the processes."""
+
+    def acquire(self, key, limit=None, global_limit=None, timeout=0):
+        """Acquire an export slot.
+
+        :param key: string - the export endpoint key.
+        :param limit: integer - the maximum number of concurrent exports for
+            this endpoint, None for no limit.
+        :param global_limit: integer - the maximum number of concurrent
+            exports for all the endpoints, None for no limit.
+        :param timeout: float - seconds to wait for a free slot.
+        :returns: the slot to release, None if no slot is available.
+        """
+        slot = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        limits = [-1 if value is None else value for value in (limit, global_limit)]
+        while True:
+            now = time.time()
+            if self.try_acquire(keys=self._keys(key), args=[now, now + self.lease, *limits, slot]):
+                break
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+        with self.condition:
+            self.running[key] += 1
+        return slot
+
+    def release(self, key, slot=None, aborted=False):
+        """Release an export slot.
+
+        :param key: string - the export endpoint key.
+        :param slot: the slot returned by `acquire`.
+        :param aborted: boolean - the export has been aborted by the client.
+        """
+        try:
+            with self.client.pipeline() as pipeline:
+                for name in self._keys(key):
+                    pipeline.zrem(name, slot)
+                pipeline.execute()
+        finally:
+            super().release(key, aborted=aborted)
@@ -0,0 +1,204 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export metrics.
+
+The export responses are measured while they are streamed and the measures
+are sent with the `export_finished` signal when the response is closed. The
+time spent to fetch the hits from the search cluster is separated from the
+time spent to serialize (and compress) them, to know which one is the
+bottleneck.
+"""
+
+from threading import Lock
+from time import perf_counter
+
+from flask import current_app
+
+from .signals import export_finished
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+
+class ExportMetrics:
+    """Measures of an export response."""
+
+    def __init__(self, endpoint):
+        """Init magic method.
+
+        :param endpoint: string - the export endpoint name.
+        """
+        self.endpoint = endpoint
+        # the response can be closed outside of the application context
+        self.app = current_app._get_current_object()
+        self.started = perf_counter()
+        self.time_to_first_byte = None
+        self.duration = None
+        self.fetch_time = 0.0
+        self.response_time = 0.0
+        self.documents = 0
+        self.bytes = 0
+        self.completed = False
+
+    @property
+    def serialization_time(self):
+        """Time spent to serialize the hits, excluding the fetch time."""
+        return max(self.response_time - self.fetch_time, 0.0)
+
+    @property
+    def aborted(self):
+        """The response has been closed before the end (client abort)."""
+        return not self.completed
+
+    @property
+    def documents_per_second(self):
+        """Exported documents per second."""
+        return self.documents / self.duration if self.duration else 0.0
+
+    @property
+    def bytes_per_second(self):
+        """Emitted bytes per second."""
+        return self.bytes / self.duration if self.duration else 0.0
+
+    def track_hits(self, hits):
+        """Measure the hits fetching.
+
+        :param hits: the iterator over the search hits.
+        :returns: an iterator over the same hits.
+        """
+        iterator = iter(hits)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    hit = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.fetch_time += perf_counter() - start
+                self.documents += 1
+                yield hit
+        finally:
+            if hasattr(hits, "close"):
+                hits.close()
+
+    def track_response(self, chunks):
+        """Measure the response streaming.
+
+        :param chunks: the iterator over the response body.
+        :returns: an iterator over the same chunks.
+        """
+        iterator = iter(chunks)
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    self.completed = True
+                    return
+                finally:
+                    self.response_time += perf_counter() - start
+                if chunk and self.time_to_first_byte is None:
+                    self.time_to_first_byte = perf_counter() - self.started
+                self.bytes += len(chunk.encode() if isinstance(chunk, str) else chunk)
+                yield chunk
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    def finish(self):
+        """Send the measures once the response is closed."""
+        self.duration = perf_counter() - self.started
+        export_finished.send(self.app, metrics=self)
+
+    def to_dict(self):
+        """Get the measures as a dict."""
+        return {
+            "endpoint": self.endpoint,
+            "time_to_first_byte": self.time_to_first_byte,
+            "duration": self.duration,
+            "fetch_time": self.fetch_time,
+            "serialization_time": self.serialization_time,
+            "documents": self.documents,
+            "documents_per_second": self.documents_per_second,
+            "bytes": self.bytes,
+            "bytes_per_second": self.bytes_per_second,
+            "aborted": self.aborted,
+        }
+
+
+def log_metrics(sender, metrics, **kwargs):
+    """Log the export measures.
+
+    :param sender: the current application.
+    :param metrics: the export measures.
+    """
+    sender.logger.info(f"Export metrics: {metrics.to_dict()}")
+
+
+_prometheus_metrics = {}
+_prometheus_lock = Lock()
+
+
+def get_prometheus_metrics():
+    """Get the Prometheus collectors of the export measures.
+
+    The collectors are registered once in the default registry, the lock
+    prevents two exports finishing at once to register them twice.
+
+    :returns: a dict of collectors by measure name.
+    """
+    with _prometheus_lock:
+        if not _prometheus_metrics:
+            histogram, counter = prometheus_client.Histogram, prometheus_client.Counter
+            labels = ["endpoint"]
+            _prometheus_metrics.update(
+                {
+                    "time_to_first_byte": histogram(
+                        "rero_export_time_to_first_byte_seconds", "Export time to first byte.", labels
+                    ),
+                    "duration": histogram("rero_export_duration_seconds", "Export duration.", labels),
+                    "fetch_time": counter("rero_export_fetch_seconds", "Time spent to fetch the hits.", labels),
+                    "serialization_time": counter(
+                        "rero_export_serialization_seconds", "Time spent to serialize the hits.", labels
+                    ),
+                    "documents": counter("rero_export_documents", "Exported documents.", labels),
+                    "bytes": counter("rero_export_bytes", "Emitted bytes.", labels),
+                    "aborted": counter("rero_export_aborted", "Exports aborted by the client.", labels),
+                }
+            )
+    return _prometheus_metrics
+
+
+def prometheus_metrics(sender, metrics, **kwargs):
+    """Record the export measures in the Prometheus default registry.
+
+    Requires the `prometheus_client` package.
+
+    :param sender: the current application.
+    :param metrics: the export measures.
+    """
+    recorders = get_prometheus_metrics()
+    if metrics.time_to_first_byte is not None:
+        recorders["time_to_first_byte"].labels(metrics.endpoint).observe(metrics.time_to_first_byte)
+    recorders["duration"].labels(metrics.endpoint).observe(metrics.duration)
+    for name in ["fetch_time", "serialization_time", "documents", "bytes"]:
+        recorders[name].labels(metrics.endpoint).inc(getattr(metrics, name))
+    if metrics.aborted:
+        recorders["aborted"].labels(metrics.endpoint).inc()
@@ -0,0 +1,130 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export stream serializers."""
+
+from collections.abc import Mapping
+
+from flask import current_app, stream_with_context
+from invenio_records_rest.utils import obj_or_import_string
+
+from ..utils import chunk
+
+
+class LazySerializers(Mapping):
+    """Serializers by mimetype imported on first use.
+
+    The serializers are given as import paths and resolved on the first
+    request for their mimetype, so the processes never exporting do not
+    import the serializer modules. The mapping is shared by all the requests
+    of an export endpoint to keep the resolved serializers.
+    """
+
+    def __init__(self, serializers):
+        """Init magic method.
+
+        :param serializers: dict - the serializers or their import paths by
+            mimetype.
+        """
+        self.serializers = dict(serializers)
+        self.loaded = {}
+
+    def __getitem__(self, mimetype):
+        """Get the serializer of a mimetype, importing it if needed."""
+        if mimetype not in self.loaded:
+            self.loaded[mimetype] = obj_or_import_string(self.serializers[mimetype])
+        return self.loaded[mimetype]
+
+    def __iter__(self):
+        """Iterate over the mimetypes."""
+        return iter(self.serializers)
+
+    def __len__(self):
+        """Get the number of serializers."""
+        return len(self.serializers)
+
+
+class BatchSerializerMixin:
+    """Serializer mixin streaming search results by batches of hits.
+
+    Subclasses implement ``serialize_batch`` to serialize a batch of hits at
+    once, i.e. to resolve all the linked records of the batch with a single
+    query. The batches are the ones of the export endpoint (see the
+    ``search_batch_size`` configuration) or ``batch_size`` hits otherwise.
+    """
+
+    batch_size = 100
+    """Number of hits per batch if the search result is not batched."""
+
+    source_includes = None
+    """Source fields needed by the serializer, None for the full source."""
+
+    def serialize_search(self, pid_fetcher, search_result, links=None, item_links_factory=None, **kwargs):
+        """Serialize a search result.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param search_result: the hits iterator.
+        :param links: Dictionary of links to add to response.
+        :param item_links_factory: Factory function for record links.
+        :returns: an iterator over the serialized batches.
+        """
+        for batch in self.batches(search_result):
+            yield self.serialize_batch(pid_fetcher, batch)
+
+    def batches(self, search_result):
+        """Get the batches of hits of a search result.
+
+        :param search_result: the hits iterator.
+        :returns: an iterator over the batches of hits.
+        """
+        if hasattr(search_result, "batches"):
+            return search_result.batches()
+        return chunk(search_result, self.batch_size)
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Serialize a batch of hits.
+
+        :param pid_fetcher: Persistent identifier fetcher.
+        :param hits: tuple - the hits of the batch.
+        :returns: the serialized batch as string or bytes.
+        """
+        raise NotImplementedError
+
+
+def stream_search_responsify(serializer, mimetype):
+    """Create a streamed response function for search results.
+
+    :param serializer: Serializer instance, ``serialize_search`` must return
+        an iterator over the serialized chunks.
+    :param mimetype: MIME type of response.
+    :returns: Function that generates a streamed record HTTP response.
+    """
+
+    def view(pid_fetcher, search_result, code=200, headers=None, links=None, item_links_factory=None):
+        content = serializer.serialize_search(
+            pid_fetcher,
+            search_result,
+            links=links,
+            item_links_factory=item_links_factory,
+        )
+        response = current_app.response_class(stream_with_context(content), mimetype=mimetype)
+        response.status_code = code
+        if headers is not None:
+            response.headers.extend(headers)
+        return response
+
+    # allows the export view to inspect the serializer (i.e. `source_includes`)
+    view.serializer = serializer
+    return view
@@ -0,0 +1,37 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export signals."""
+
+from blinker import Namespace
+
+_signals = Namespace()
+
+export_finished = _signals.signal("export-finished")
+"""Signal sent when an export response is closed.
+
+The sender is the current application and the export measures can be
+retrieved from `kwargs['metrics']` (see `metrics.ExportMetrics`).
+Example event listener (subscriber) implementation:
+
+.. code-block:: python
+
+    def listener(sender, metrics, **kwargs):
+        if metrics.aborted:
+            ...
+
+    from rero_invenio_base.modules.export.signals import export_finished
+    export_finished.connect(listener)
+"""
@@ -0,0 +1,55 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""RERO Invenio Base export celery tasks."""
+
+from celery import shared_task
+from flask import current_app
+
+from .jobs import ExportJob, login_job_owner
+from .views import create_export_resource
+
+
+@shared_task(ignore_result=True)
+def export_job(job_id, endpoint, query_string, mimetype):
+    """Run an asynchronous export job.
+
+    The export runs with the permissions of the job owner.
+
+    :param job_id: string - the job identifier.
+    :param endpoint: string - the export endpoint name.
+    :param query_string: string - the export query string.
+    :param mimetype: string - the mimetype of the export.
+    """
+    job = ExportJob(job_id)
+    with current_app.test_request_context(query_string=query_string, headers={"Accept": mimetype}):
+        if (owner := job.owner) is not None:
+            try:
+                login_job_owner(owner)
+            except ValueError as err:
+                job.update(state=ExportJob.FAILURE, error=str(err))
+                raise
+        job.run(create_export_resource(endpoint))
+
+
+@shared_task(ignore_result=True)
+def clean_export_jobs(max_age=None):
+    """Delete the old asynchronous export jobs.
+
+    :param max_age: integer - the jobs maximum age in seconds, default to
+        `RERO_INVENIO_BASE_EXPORT_JOBS_MAX_AGE`.
+    :returns: the number of deleted jobs.
+    """
+    return ExportJob.clean(max_age or current_app.config["RERO_INVENIO_BASE_EXPORT_JOBS_MAX_AGE"])
@@ -16,16 +16,28 @@
 
 """RERO Invenio Base exports views."""
 
-from copy import deepcopy
 from functools import partial
+from inspect import signature
+from mimetypes import guess_extension
 
-from flask import Blueprint
+from flask import Blueprint, abort, current_app, jsonify, request, send_file, url_for
+from flask.views import MethodView
 from invenio_pidstore import current_pidstore
 from invenio_records_rest.query import es_search_factory
 from invenio_records_rest.utils import obj_or_import_string
 from invenio_records_rest.views import need_record_permission
 from invenio_rest import ContentNegotiatedMethodView
 from invenio_search import RecordsSearch
+from werkzeug.exceptions import TooManyRequests
+
+from .cache import export_cache_key
+from .compression import compress_response
+from .continuation import ExportContinuation
+from .iterators import BatchedHits, close_hits, scan
+from .jobs import ExportJob, current_user_id
+from .metrics import ExportMetrics
+from .proxies import current_export
+from .serializers import LazySerializers
 
 
 def create_blueprint_from_app(app):
@@ -42,14 +54,36 @@ def create_blueprint_from_app(app):
     api_blueprint = Blueprint("api_exports", __name__, url_prefix="")
     endpoints = app.config.get("RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS", {})
     for key, config in endpoints.items():
-        copy_config = deepcopy(config)
-        resource_config = copy_config.pop("resource", {})
-        route_config = {**resource_config, **copy_config}  # merging dict
+        route_config = _route_config(config)
         rule = create_export_url_route(key, **route_config)
         api_blueprint.add_url_rule(**rule)
+        if route_config.get("export_jobs"):
+            for rule in create_export_job_url_rules(key, **route_config):
+                api_blueprint.add_url_rule(**rule)
     return api_blueprint
 
 
+def _route_config(config):
+    """Merge an export endpoint configuration with its resource configuration.
+
+    :param config: the export endpoint configuration.
+    :returns: the route configuration.
+    """
+    endpoint_config = {key: value for key, value in config.items() if key != "resource"}
+    return {**config.get("resource", {}), **endpoint_config}  # merging dict
+
+
+def create_export_resource(endpoint):
+    """Create the export resource of an endpoint outside of a view.
+
+    :param endpoint: string - the export endpoint name.
+    :returns: the export resource.
+    """
+    config = current_app.config["RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS"][endpoint]
+    view_func = create_export_url_route(endpoint, **_route_config(config))["view_func"]
+    return view_func.view_class(**view_func.view_kwargs)
+
+
 def create_export_url_route(
     endpoint,
     default_media_type=None,
@@ -58,8 +92,15 @@ def create_export_url_route(
     pid_fetcher=None,
     search_class=None,
     search_factory_imp=None,
+    search_iterator_imp=None,
+    search_iterator_options=None,
+    search_batch_size=None,
+    search_source_includes=None,
     search_serializers=None,
     search_serializers_aliases=None,
+    continuation_checkpoint=None,
+    export_cache=False,
+    max_concurrent_exports=None,
     **kwargs,
 ):
     """Create Werkzeug URL rule for resource streamed export.
@@ -86,19 +127,70 @@ def create_export_url_route(
 
     search_class = obj_or_import_string(search_class, default=RecordsSearch)
 
-    export_view = ExportResource.as_view(
-        view_name,
-        default_media_type=default_media_type,
-        permission_factory=permission_factory,
-        pid_fetcher=pid_fetcher,
-        search_class=search_class,
-        search_serializers=search_serializers,
-        serializers_query_aliases=search_serializers_aliases,
-        search_factory=obj_or_import_string(search_factory_imp, default=es_search_factory),
+    # SEARCH ITERATOR
+    #   The iterator used to retrieve all the search hits. By default, a single
+    #   scroll cursor is used (see `iterators.py` for the available ones).
+    search_iterator = partial(
+        obj_or_import_string(search_iterator_imp, default=scan),
+        **(search_iterator_options or {}),
     )
+    #   Resuming an export requires an iterator based on sort values.
+    if continuation_checkpoint:
+        assert "search_after" in signature(search_iterator).parameters
+
+    view_kwargs = {
+        "default_media_type": default_media_type,
+        "permission_factory": permission_factory,
+        "pid_fetcher": pid_fetcher,
+        "search_class": search_class,
+        "search_iterator": search_iterator,
+        "search_batch_size": search_batch_size,
+        "search_source_includes": search_source_includes,
+        # SERIALIZERS
+        #   Imported on the first request for their mimetype.
+        "search_serializers": LazySerializers(search_serializers),
+        "serializers_query_aliases": search_serializers_aliases,
+        "search_factory": obj_or_import_string(search_factory_imp, default=es_search_factory),
+        "continuation_checkpoint": continuation_checkpoint,
+        "export_cache": export_cache,
+        "max_concurrent_exports": max_concurrent_exports,
+    }
+    export_view = ExportResource.as_view(view_name, **view_kwargs)
+    # keep the arguments to create the resource outside of a view (export jobs)
+    export_view.view_kwargs = view_kwargs
     return {"rule": list_route, "view_func": export_view}
 
 
+def create_export_job_url_rules(endpoint, list_route=None, list_permission_factory_imp=None, **kwargs):
+    """Create Werkzeug URL rules for resource asynchronous export jobs.
+
+    :param endpoint: string - the export endpoint name.
+    :param list_route: string - the resource list route.
+    :param list_permission_factory_imp: the resource list permission.
+    :returns: a list of configuration dict who can be passed as keywords
+        argument to ``Blueprint.add_url_rule``.
+    """
+    assert list_route
+    list_route = f"/export{list_route}jobs/"
+    permission_factory = obj_or_import_string(list_permission_factory_imp)
+    views = [
+        (list_route, "jobs", ExportJobListResource),
+        (f"{list_route}<job_id>", "job", ExportJobResource),
+        (f"{list_route}<job_id>/download", "job_download", ExportJobDownloadResource),
+    ]
+    return [
+        {
+            "rule": rule,
+            "view_func": view_class.as_view(
+                f"{endpoint}_export_{name}",
+                endpoint=endpoint,
+                permission_factory=permission_factory,
+            ),
+        }
+        for rule, name, view_class in views
+    ]
+
+
 class ExportResource(ContentNegotiatedMethodView):
     """Resource for records streamed exports."""
 
@@ -109,16 +201,21 @@ class ExportResource(ContentNegotiatedMethodView):
         pid_fetcher=None,
         search_class=None,
         search_factory=None,
+        search_iterator=None,
+        search_batch_size=None,
+        search_source_includes=None,
         search_serializers=None,
         serializers_query_aliases=None,
+        continuation_checkpoint=None,
+        export_cache=False,
+        max_concurrent_exports=None,
         **kwargs,
     ):
         """Init magic method."""
-        serializers = {
-            mime: obj_or_import_string(search_obj) for mime, search_obj in search_serializers.items() or {}.items()
-        }
+        if not isinstance(search_serializers, LazySerializers):
+            search_serializers = LazySerializers(search_serializers or {})
         super().__init__(
-            method_serializers={"GET": serializers},
+            method_serializers={"GET": search_serializers},
             serializers_query_aliases=serializers_query_aliases,
             default_method_media_type={"GET": default_media_type},
             default_media_type=default_media_type,
@@ -128,12 +225,221 @@ class ExportResource(ContentNegotiatedMethodView):
         self.pid_fetcher = current_pidstore.fetchers[pid_fetcher]
         self.search_class = search_class
         self.search_factory = partial(search_factory, self)
+        self.search_iterator = search_iterator or scan
+        self.search_batch_size = search_batch_size
+        self.search_source_includes = search_source_includes
+        self.continuation_checkpoint = continuation_checkpoint
+        # continuation tokens are specific to each response
+        self.export_cache = export_cache and not continuation_checkpoint
+        self.max_concurrent_exports = max_concurrent_exports
+        self.metrics = None
 
     @need_record_permission("permission_factory")
     def get(self, **kwargs):
-        """Implement GET /export/{resource_list_name}."""
+        """Implement GET /export/{resource_list_name}.
+
+        The number of concurrent exports is limited: when no export slot is
+        available in the configured delay, a `429 Too Many Requests` error
+        is returned. The response is measured and the measures are sent with
+        the `export_finished` signal once it is closed. The WSGI server
+        closes the response when the client disconnects: the search context
+        and the export slot are then released immediately.
+        """
+        config = current_app.config
+        key = request.endpoint
+        limiter = current_export.limiter
+        slot = limiter.acquire(
+            key,
+            limit=self.max_concurrent_exports,
+            global_limit=config["RERO_INVENIO_BASE_EXPORT_MAX_CONCURRENT"],
+            timeout=config["RERO_INVENIO_BASE_EXPORT_QUEUE_TIMEOUT"],
+        )
+        if slot is None:
+            raise TooManyRequests(retry_after=config["RERO_INVENIO_BASE_EXPORT_RETRY_AFTER"])
+        metrics = self.metrics = ExportMetrics(key)
+        try:
+            response = self.export()
+        except Exception:
+            limiter.release(key, slot)
+            raise
+        response.response = metrics.track_response(response.response)
+
+        def finish():
+            """Release the export slot once the response is closed."""
+            try:
+                metrics.finish()
+            finally:
+                limiter.release(key, slot, aborted=metrics.aborted)
+            if metrics.aborted:
+                metrics.app.logger.info(f"Export {key} aborted by the client after {metrics.documents} documents.")
+
+        response.call_on_close(finish)
+        return response
+
+    def export(self):
+        """Export all the records matching the current request.
+
+        The access permissions must be checked by the caller.
+
+        :returns: the streamed response.
+        """
         search_obj = self.search_class()
         search = search_obj.with_preference_param().params(version=True)
         search, _ = self.search_factory(search)
+        if includes := self._source_includes():
+            search = search.source(includes=includes)
+
+        cache_key = None
+        if self.export_cache:
+            cache_key = export_cache_key(search, self.mimetype())
+            if cached := current_export.cache.get(cache_key):
+                headers, content = cached
+                return compress_response(current_app.response_class(content, headers=headers))
+
+        hits = self._iterate(search)
+        response = self.make_response(pid_fetcher=None, search_result=hits)
+        # release the search context (scroll, point in time, ...) as soon as
+        # the response is closed, even if it has not been fully consumed
+        # (i.e. the client disconnected).
+        if hasattr(hits, "close"):
+            response.call_on_close(partial(close_hits, hits, current_app.logger))
+        if cache_key and response.status_code == 200:
+            response.response = current_export.cache.store(cache_key, response.response, response.headers)
+        return compress_response(response)
+
+    def mimetype(self):
+        """Get the mimetype of the serializer of the current request."""
+        serializers, default_media_type = self.get_method_serializers("GET")
+        serializer = self.match_serializers(serializers, default_media_type)
+        # only the matched serializer is imported
+        return next((mimetype for mimetype, func in serializers.loaded.items() if func is serializer), None)
+
+    def _source_includes(self):
+        """Get the source fields needed by the export.
 
-        return self.make_response(pid_fetcher=None, search_result=search.scan())
+        The fields are the ones of the endpoint configuration, otherwise the
+        ones declared by the serializer of the request (``source_includes``
+        attribute).
+
+        :returns: the list of source fields or None for the full source.
+        """
+        if self.search_source_includes:
+            return self.search_source_includes
+        serializer = self.match_serializers(*self.get_method_serializers("GET"))
+        serializer = getattr(serializer, "serializer", serializer)
+        return getattr(serializer, "source_includes", None)
+
+    def _iterate(self, search):
+        """Get the iterator over all the search hits.
+
+        If continuation tokens are enabled, the export is resumed after the
+        hit of the given continuation token and new tokens are attached to
+        the hits. If a batch size is configured, the hits are grouped by
+        batches for the serializers supporting it. The hits fetching is
+        measured when the export metrics are enabled.
+
+        :param search: the search to iterate.
+        :returns: an iterator over the search hits.
+        """
+        search_iterator = self.search_iterator
+        arg_name = current_app.config["RERO_INVENIO_BASE_EXPORT_CONTINUATION_ARG_NAME"]
+        token = request.args.get(arg_name)
+        if self.continuation_checkpoint:
+            continuation = ExportContinuation.from_request()
+            if token:
+                search_iterator = partial(search_iterator, search_after=continuation.loads(token))
+            hits = continuation.checkpoints(search_iterator(search), self.continuation_checkpoint)
+        elif token:
+            abort(400, "This export can not be resumed.")
+        else:
+            hits = search_iterator(search)
+        if self.metrics:
+            hits = self.metrics.track_hits(hits)
+        if self.search_batch_size:
+            hits = BatchedHits(hits, self.search_batch_size)
+        return hits
+
+
+class ExportJobView(MethodView):
+    """Base resource for asynchronous export jobs."""
+
+    def __init__(self, endpoint=None, permission_factory=None):
+        """Init magic method."""
+        self.endpoint = endpoint
+        self.permission_factory = permission_factory
+
+    def get_job(self, job_id):
+        """Get an export job of the current endpoint and user.
+
+        The jobs of the other users are not found.
+
+        :param job_id: string - the job identifier.
+        :returns: the job and its status.
+        """
+        try:
+            job = ExportJob(job_id)
+        except ValueError:
+            abort(404)
+        status = job.status
+        if not status or status.get("endpoint") != self.endpoint or status.get("owner") != current_user_id():
+            abort(404)
+        return job, status
+
+    def dump_job(self, job, status):
+        """Serialize an export job.
+
+        :param job: the export job.
+        :param status: the job status.
+        :returns: the JSON response.
+        """
+        links = {"self": url_for(f".{self.endpoint}_export_job", job_id=job.id, _external=True)}
+        if status["state"] == ExportJob.SUCCESS:
+            links["download"] = url_for(f".{self.endpoint}_export_job_download", job_id=job.id, _external=True)
+        return jsonify({"id": job.id, **status, "links": links})
+
+
+class ExportJobListResource(ExportJobView):
+    """Resource to create asynchronous export jobs."""
+
+    @need_record_permission("permission_factory")
+    def post(self, **kwargs):
+        """Implement POST /export/{resource_list_name}/jobs/.
+
+        The job exports the records matching the query string, using the
+        format given by the `Accept` header or the `format` query arg.
+        """
+        resource = create_export_resource(self.endpoint)
+        if not (mimetype := resource.mimetype()):
+            abort(406)
+        job = ExportJob.create(self.endpoint, request.query_string.decode(), mimetype)
+        response = self.dump_job(job, job.status)
+        response.status_code = 202
+        response.headers["Location"] = response.json["links"]["self"]
+        return response
+
+
+class ExportJobResource(ExportJobView):
+    """Resource to get the status of an asynchronous export job."""
+
+    @need_record_permission("permission_factory")
+    def get(self, job_id, **kwargs):
+        """Implement GET /export/{resource_list_name}/jobs/{job_id}."""
+        return self.dump_job(*self.get_job(job_id))
+
+
+class ExportJobDownloadResource(ExportJobView):
+    """Resource to download the result of an asynchronous export job."""
+
+    @need_record_permission("permission_factory")
+    def get(self, job_id, **kwargs):
+        """Implement GET /export/{resource_list_name}/jobs/{job_id}/download."""
+        job, status = self.get_job(job_id)
+        if status["state"] != ExportJob.SUCCESS:
+            abort(404)
+        extension = guess_extension(status["mimetype"]) or ""
+        return send_file(
+            job.path,
+            mimetype=status["mimetype"],
+            as_attachment=True,
+            download_name=f"{self.endpoint}-export{extension}",
+        )
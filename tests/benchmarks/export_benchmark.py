@@ -0,0 +1,257 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Export views benchmark.
+
+The export views are driven through the Flask test client against a fake
+search client generating synthetic hits, so the benchmark measures the
+export stack (iterators, serializers, compression) without a search
+cluster. Each mode runs in a dedicated process to get its own peak RSS.
+
+Usage:
+
+.. code-block:: console
+
+    $ python tests/benchmarks/export_benchmark.py --documents 100000 --size 1024
+"""
+
+import itertools
+import json
+import multiprocessing
+import resource
+import sys
+import threading
+
+import click
+from flask import Flask
+from invenio_pidstore import InvenioPIDStore
+from invenio_search import RecordsSearch
+
+from rero_invenio_base.modules.export.ext import ReroInvenioBaseExportApp
+from rero_invenio_base.modules.export.serializers import (
+    BatchSerializerMixin,
+    stream_search_responsify,
+)
+from rero_invenio_base.modules.export.signals import export_finished
+from rero_invenio_base.modules.export.views import create_blueprint_from_app
+
+
+class FakeSearchClient:
+    """Search client generating synthetic hits.
+
+    Only the scroll API used by the `scan` helper is implemented. The sliced
+    scrolls return the hits whose position modulo the number of slices is the
+    slice identifier.
+    """
+
+    def __init__(self, documents=10000, size=1024, page_size=1000):
+        """Init magic method.
+
+        :param documents: integer - the number of generated hits.
+        :param size: integer - the approximative size of the documents.
+        :param page_size: integer - the number of hits per scroll page.
+        """
+        self.documents = documents
+        self.page_size = page_size
+        self.text = "x" * size
+        self.scrolls = {}
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+
+    def hit(self, position):
+        """Generate a hit."""
+        pid = str(position)
+        return {
+            "_index": "benchmark",
+            "_id": pid,
+            "_version": 1,
+            "_source": {"pid": pid, "title": f"Document {pid}", "text": self.text},
+        }
+
+    def page(self, scroll_id):
+        """Get the next page of a scroll."""
+        positions = self.scrolls[scroll_id]
+        return {
+            "_scroll_id": scroll_id,
+            "_shards": {"total": 1, "successful": 1, "skipped": 0},
+            "hits": {"hits": [self.hit(position) for position in itertools.islice(positions, self.page_size)]},
+        }
+
+    def search(self, body=None, **kwargs):
+        """Open a scroll."""
+        sliced = (body or {}).get("slice", {"id": 0, "max": 1})
+        with self.lock:
+            scroll_id = str(next(self.ids))
+        self.scrolls[scroll_id] = iter(range(sliced["id"], self.documents, sliced["max"]))
+        return self.page(scroll_id)
+
+    def scroll(self, body=None, **kwargs):
+        """Get the next scroll page."""
+        return self.page(body["scroll_id"])
+
+    def clear_scroll(self, body=None, **kwargs):
+        """Close scrolls."""
+        for scroll_id in body["scroll_id"]:
+            self.scrolls.pop(scroll_id, None)
+
+
+class BenchmarkSearch(RecordsSearch):
+    """Search on the fake search client."""
+
+    client = None
+
+    class Meta:
+        """Configuration for the search."""
+
+        index = "benchmark"
+
+    def __init__(self, **kwargs):
+        """Init magic method."""
+        kwargs.setdefault("using", self.client)
+        super().__init__(**kwargs)
+
+
+def search_factory(view, search):
+    """Export all the documents."""
+    return search, {}
+
+
+class JSONLinesSerializer:
+    """Serializer writing one JSON document per line, hit by hit."""
+
+    def serialize_search(self, pid_fetcher, search_result, **kwargs):
+        """Serialize the hits."""
+        for hit in search_result:
+            yield json.dumps(hit.to_dict()) + "\n"
+
+
+class JSONLinesBatchSerializer(BatchSerializerMixin):
+    """Serializer writing one JSON document per line, batch by batch."""
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Serialize a batch of hits."""
+        return "".join(json.dumps(hit.to_dict()) + "\n" for hit in hits)
+
+
+MODES = {
+    "scan": {
+        "search_serializers": {
+            "application/x-ndjson": stream_search_responsify(JSONLinesSerializer(), "application/x-ndjson")
+        },
+    },
+    "sliced": {
+        "search_iterator_imp": "rero_invenio_base.modules.export.iterators:sliced_scan",
+        "search_iterator_options": {"slices": 4},
+        "search_serializers": {
+            "application/x-ndjson": stream_search_responsify(JSONLinesSerializer(), "application/x-ndjson")
+        },
+    },
+    "batched": {
+        "search_batch_size": 1000,
+        "search_serializers": {
+            "application/x-ndjson": stream_search_responsify(JSONLinesBatchSerializer(), "application/x-ndjson")
+        },
+    },
+}
+"""Benchmarked export endpoint configurations."""
+
+
+def create_benchmark_app(mode):
+    """Create an application with the export endpoint of a mode."""
+    app = Flask("benchmark")
+    app.config["RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS"] = {
+        "benchmark": {
+            "resource": {
+                "list_route": "/benchmark/",
+                "pid_fetcher": "recid",
+                "search_class": BenchmarkSearch,
+                "search_factory_imp": search_factory,
+                "list_permission_factory_imp": "invenio_records_rest.utils:allow_all",
+            },
+            "default_media_type": "application/x-ndjson",
+            **MODES[mode],
+        }
+    }
+    InvenioPIDStore(app)
+    ReroInvenioBaseExportApp(app)
+    app.register_blueprint(create_blueprint_from_app(app))
+    return app
+
+
+def peak_rss():
+    """Get the peak resident set size of the current process in bytes."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_benchmark(mode, documents=10000, size=1024, encoding=None):
+    """Export the synthetic documents and measure the response.
+
+    :param mode: string - the export mode (see `MODES`).
+    :param documents: integer - the number of exported documents.
+    :param size: integer - the approximative size of the documents.
+    :param encoding: string - the requested content encoding.
+    :returns: the export measures.
+    """
+    BenchmarkSearch.client = FakeSearchClient(documents=documents, size=size)
+    app = create_benchmark_app(mode)
+    measures = []
+    headers = {"Accept-Encoding": encoding} if encoding else {}
+    with export_finished.connected_to(lambda sender, metrics: measures.append(metrics), sender=app):
+        response = app.test_client().get("/export/benchmark/", headers=headers)
+        # consume the response without keeping it in memory
+        for _ in response.response:
+            pass
+        response.close()
+    return {"mode": mode, **measures[0].to_dict(), "peak_rss": peak_rss()}
+
+
+def run_isolated_benchmark(*args, **kwargs):
+    """Run a benchmark in a new process."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_benchmark, args, kwargs)
+
+
+@click.command()
+@click.option("-d", "--documents", default=10000, help="Number of exported documents.")
+@click.option("-s", "--size", default=1024, help="Approximative size of the documents in bytes.")
+@click.option("-m", "--mode", "modes", multiple=True, type=click.Choice(list(MODES)), help="Modes to benchmark.")
+@click.option("-e", "--encoding", type=click.Choice(["gzip", "zstd"]), help="Requested content encoding.")
+@click.option("--json", "as_json", is_flag=True, default=False, help="Output the measures as JSON lines.")
+def benchmark(documents, size, modes, encoding, as_json):
+    """Benchmark the export views."""
+    if not as_json:
+        click.secho(
+            f"{'mode':<8} {'docs/s':>10} {'MB/s':>8} {'TTFB ms':>8} {'fetch s':>8} "
+            f"{'serial. s':>9} {'total s':>8} {'RSS MB':>8}",
+            bold=True,
+        )
+    for mode in modes or MODES:
+        measures = run_isolated_benchmark(mode, documents=documents, size=size, encoding=encoding)
+        if as_json:
+            click.echo(json.dumps(measures))
+            continue
+        click.echo(
+            f"{mode:<8} {measures['documents_per_second']:>10.0f} "
+            f"{measures['bytes_per_second'] / 2**20:>8.1f} "
+            f"{(measures['time_to_first_byte'] or 0) * 1000:>8.1f} "
+            f"{measures['fetch_time']:>8.2f} {measures['serialization_time']:>9.2f} "
+            f"{measures['duration']:>8.2f} {measures['peak_rss'] / 2**20:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,548 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test cli elasticsearch index commands on a fake cluster."""
+
+import contextlib
+import importlib
+import json
+
+import pytest
+from elasticsearch import NotFoundError, TransportError
+from invenio_search import current_search
+
+from rero_invenio_base.cli.es.index import (
+    move_batch,
+    move_index,
+    reindex,
+    rethrottle,
+    switch_index,
+    templates,
+    update_mapping,
+)
+
+# the module is shadowed by the click group of the same name
+index_module = importlib.import_module("rero_invenio_base.cli.es.index")
+
+
+class FakeIndicesClient:
+    """Minimal indices client."""
+
+    def __init__(self, cluster):
+        """Init magic method."""
+        self.cluster = cluster
+
+    def create(self, index, body=None, **kwargs):
+        """Create an index."""
+        self.cluster.data[index] = {
+            "aliases": {},
+            "docs": {},
+            "body": body,
+            "settings": {"number_of_shards": "1", "number_of_replicas": "1"},
+        }
+
+    def get_alias(self, index=None, name=None, **kwargs):
+        """Get the aliases."""
+        res = {
+            key: {"aliases": dict(data["aliases"])}
+            for key, data in self.cluster.data.items()
+            if index in [None, key] and (name is None or name in data["aliases"])
+        }
+        if name and not res:
+            raise NotFoundError(404, "aliases_not_found_exception")
+        return res
+
+    def put_alias(self, index, name, **kwargs):
+        """Add an alias."""
+        self.cluster.data[index]["aliases"][name] = {}
+        self.cluster.calls.append(("put_alias", index, name))
+
+    def delete_alias(self, index, name, **kwargs):
+        """Remove an alias."""
+        del self.cluster.data[index]["aliases"][name]
+        self.cluster.calls.append(("delete_alias", index, name))
+
+    def update_aliases(self, body, **kwargs):
+        """Apply alias actions."""
+        for action in body["actions"]:
+            ((name, properties),) = action.items()
+            index, alias = properties["index"], properties["alias"]
+            if name == "add":
+                self.cluster.data[index]["aliases"][alias] = {
+                    key: value for key, value in properties.items() if key not in ["index", "alias"]
+                }
+            else:
+                del self.cluster.data[index]["aliases"][alias]
+        self.cluster.calls.append(("update_aliases", body))
+
+    def get(self, index, **kwargs):
+        """Get the state of indices."""
+        names = index.split(",")
+        return {
+            key: {
+                "aliases": dict(data["aliases"]),
+                "mappings": (data["body"] or {}).get("mappings", {}),
+                "settings": {"index": dict(data["settings"])},
+            }
+            for key, data in self.cluster.data.items()
+            if key in names or set(names) & set(data["aliases"])
+        }
+
+    def get_template(self, **kwargs):
+        """Get the templates."""
+        return dict(self.cluster.templates)
+
+    def put_template(self, name, body, **kwargs):
+        """Put a template."""
+        self.cluster.templates[name] = body
+        self.cluster.calls.append(("put_template", name))
+        return {"acknowledged": True}
+
+    def get_settings(self, index, **kwargs):
+        """Get the settings of an index."""
+        return {index: {"settings": {"index": dict(self.cluster.data[index]["settings"])}}}
+
+    def put_settings(self, index, body, **kwargs):
+        """Update the settings of an index."""
+        for key, value in body["index"].items():
+            if value is None:
+                self.cluster.data[index]["settings"].pop(key, None)
+            else:
+                self.cluster.data[index]["settings"][key] = str(value)
+        self.cluster.calls.append(("put_settings", index, body))
+        return {"acknowledged": True}
+
+    def close(self, index, **kwargs):
+        """Close indices."""
+        self.cluster.calls.append(("close", index))
+
+    def open(self, index, **kwargs):
+        """Open indices."""
+        self.cluster.calls.append(("open", index))
+
+    def put_mapping(self, index, body, **kwargs):
+        """Update the mapping of an index."""
+        data = self.cluster.data[index]
+        data["body"] = {**(data["body"] or {}), "mappings": {**(data["body"] or {}).get("mappings", {}), **body}}
+        self.cluster.calls.append(("put_mapping", index, body))
+        return {"acknowledged": True}
+
+    def forcemerge(self, index, **kwargs):
+        """Force merge an index."""
+        self.cluster.calls.append(("forcemerge", index, kwargs))
+
+    def refresh(self, index, **kwargs):
+        """Refresh an index."""
+        self.cluster.calls.append(("refresh", index))
+
+
+class FakeClusterClient:
+    """Minimal cluster client."""
+
+    def __init__(self, cluster):
+        """Init magic method."""
+        self.cluster = cluster
+
+    def health(self, index=None, **kwargs):
+        """Get the health of an index."""
+        self.cluster.calls.append(("health", index, kwargs))
+        return {"status": self.cluster.status, "timed_out": self.cluster.status != kwargs["wait_for_status"]}
+
+
+class FakeTasksClient:
+    """Minimal tasks client, the tasks are completed at the second call."""
+
+    def __init__(self, cluster):
+        """Init magic method."""
+        self.cluster = cluster
+
+    def get(self, task_id, **kwargs):
+        """Get a task."""
+        task = self.cluster.tasks_data[task_id]
+        task["calls"] += 1
+        if task["calls"] < 2:
+            if kwargs.get("wait_for_completion"):
+                raise TransportError(408, "timeout_exception")
+            return {"completed": False, "task": {"status": {"total": task["total"], "created": 1}}}
+        self.cluster.running.discard(task_id)
+        return {
+            "completed": True,
+            "response": {
+                "total": task["total"],
+                "created": task["total"] - task["version_conflicts"],
+                "version_conflicts": task["version_conflicts"],
+                "failures": task["failures"],
+            },
+        }
+
+
+class FakeSearchClient:
+    """Minimal search client storing the indices in memory."""
+
+    def __init__(self):
+        """Init magic method."""
+        self.data = {}
+        self.tasks_data = {}
+        self.running = set()
+        self.max_running = 0
+        self.calls = []
+        self.templates = {}
+        self.status = "green"
+        self.indices = FakeIndicesClient(self)
+        self.cluster = FakeClusterClient(self)
+        self.tasks = FakeTasksClient(self)
+
+    def info(self):
+        """Get the cluster info."""
+        return {"version": {"number": "7.10.2"}}
+
+    def reindex(self, body, **kwargs):
+        """Start a reindex task."""
+        source, dest = body["source"]["index"], body["dest"]["index"]
+        docs = self.data[source]["docs"]
+        if query := body["source"].get("query"):
+            ((field, condition),) = query["range"].items()
+            docs = {pid: doc for pid, doc in docs.items() if doc.get(field, "") >= condition["gte"]}
+        failures = ["failure"] if source.startswith("broken") else []
+        # external versions: the newer destination documents are conflicts
+        dest_docs = self.data[dest]["docs"]
+        conflicts = [
+            pid for pid, doc in docs.items() if dest_docs.get(pid, {}).get("_version", 0) > doc.get("_version", 0)
+        ]
+        if conflicts and body.get("conflicts") != "proceed":
+            failures.extend({"id": pid, "status": 409} for pid in conflicts)
+        else:
+            dest_docs.update({pid: doc for pid, doc in docs.items() if pid not in conflicts})
+        task_id = f"node:{len(self.tasks_data) + 1}"
+        self.tasks_data[task_id] = {
+            "calls": 0,
+            "total": len(docs),
+            "failures": failures,
+            "version_conflicts": len(conflicts),
+        }
+        self.running.add(task_id)
+        self.max_running = max(self.max_running, len(self.running))
+        self.calls.append(("reindex", body, kwargs))
+        return {"task": task_id}
+
+    def reindex_rethrottle(self, task_id, **kwargs):
+        """Change the throttle of a reindex task."""
+        self.calls.append(("reindex_rethrottle", task_id, kwargs))
+        return {"nodes": {}}
+
+    def add_index(self, index, alias, docs=3):
+        """Add an index with documents."""
+        self.indices.create(index)
+        self.indices.put_alias(index, alias)
+        self.data[index]["docs"] = {str(pid): {"pid": str(pid)} for pid in range(docs)}
+        self.calls.clear()
+
+
+def switch_actions(old, new, alias, **properties):
+    """Get the alias actions of a switch."""
+    return [
+        {"add": {"index": new, "alias": alias, **properties}},
+        {"remove": {"index": old, "alias": alias}},
+    ]
+
+
+@pytest.fixture()
+def fake_client(base_app):
+    """Replace the search client by a fake one."""
+    state = base_app.extensions["invenio-search"]
+    client = FakeSearchClient()
+    with base_app.app_context():
+        with contextlib.suppress(AssertionError):
+            current_search.register_mappings("records", "mock_modules.mappings")
+        mapping = current_search.aliases["records"]["records-record-v1.0.0"]
+        current_search.aliases["documents"] = {"documents-document-v1.0.0": mapping}
+    original, state._client = state._client, client
+    yield client
+    state._client = original
+    with base_app.app_context():
+        current_search.aliases.pop("documents", None)
+
+
+def test_move_index(base_app, fake_client):
+    """Test move index."""
+    fake_client.add_index("records-old", "records")
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(move_index, ["records", "records-old", "records-new"])
+    assert res.exit_code == 0, res.output
+    assert fake_client.data["records-new"]["aliases"] == {"records": {}}
+    assert fake_client.data["records-old"]["aliases"] == {}
+    assert len(fake_client.data["records-new"]["docs"]) == 3
+
+    # reindex progress stream
+    res = runner.invoke(move_index, ["records", "records-new", "records-v3", "--json"])
+    assert res.exit_code == 0, res.output
+    # the human messages do not mix with the JSON lines
+    progress = [json.loads(line) for line in res.stdout.splitlines()]
+    assert [(line["done"], line["total"], line["completed"]) for line in progress] == [(1, 3, False), (3, 3, True)]
+    assert "Successfully switched." in res.stderr
+
+
+def test_move_batch(base_app, fake_client):
+    """Test move several resources concurrently."""
+    fake_client.add_index("records-old", "records")
+    fake_client.add_index("documents-old", "documents")
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(move_batch, ["--all", "-c", "1", "-s", "-new", "-n", "0"])
+    assert res.exit_code == 0, res.output
+    assert "Moved: 2/2" in res.output
+    assert fake_client.max_running == 1
+    assert fake_client.data["records-record-v1.0.0-new"]["aliases"] == {"records": {}}
+    assert fake_client.data["documents-document-v1.0.0-new"]["aliases"] == {"documents": {}}
+    assert len(fake_client.data["documents-document-v1.0.0-new"]["docs"]) == 3
+
+    # a failed reindex does not prevent the other switches
+    fake_client.add_index("broken-old", "records")
+    fake_client.indices.delete_alias("records-record-v1.0.0-new", "records")
+    res = runner.invoke(move_batch, ["records", "documents", "-c", "2", "-s", "-v2", "-n", "0"])
+    assert res.exit_code == 2
+    assert "records: ERROR REINDEX" in res.output
+    assert "Moved: 1/2" in res.output
+    assert fake_client.max_running == 2
+    assert fake_client.data["documents-document-v1.0.0-v2"]["aliases"] == {"documents": {}}
+    assert fake_client.data["broken-old"]["aliases"] == {"records": {}}
+
+
+def test_reindex_options(base_app, fake_client):
+    """Test reindex tuning options."""
+    fake_client.add_index("records-old", "records")
+    fake_client.indices.create("records-new")
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(
+        reindex,
+        ["records-old", "records-new", "--slices", "auto", "--size", "500", "--requests-per-second", "100"],
+    )
+    assert res.exit_code == 0, res.output
+    _, body, params = fake_client.calls[-1]
+    assert body["source"] == {"index": "records-old", "size": 500}
+    assert params == {"wait_for_completion": False, "slices": "auto", "requests_per_second": 100}
+
+    res = runner.invoke(reindex, ["records-old", "records-new", "--slices", "4"])
+    assert fake_client.calls[-1][2] == {"wait_for_completion": False, "slices": 4}
+    assert "size" not in fake_client.calls[-1][1]["source"]
+
+    res = runner.invoke(reindex, ["records-old", "records-new", "--slices", "0"])
+    assert res.exit_code == 2
+
+    res = runner.invoke(rethrottle, ["node:1", "--", "-1"])
+    assert res.exit_code == 0, res.output
+    assert fake_client.calls[-1] == ("reindex_rethrottle", "node:1", {"requests_per_second": -1})
+
+
+def test_move_bulk_build(base_app, fake_client):
+    """Test move index in bulk build mode."""
+    fake_client.add_index("records-old", "records")
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(move_index, ["records", "records-old", "records-new", "-b", "--force-merge", "1"])
+    assert res.exit_code == 0, res.output
+    calls = [call[:2] for call in fake_client.calls if call[0] != "reindex"]
+    assert calls == [
+        ("put_settings", "records-new"),
+        ("put_settings", "records-new"),
+        ("forcemerge", "records-new"),
+        ("refresh", "records-new"),
+        ("health", "records-new"),
+        ("update_aliases", {"actions": switch_actions("records-old", "records-new", "records")}),
+    ]
+    assert fake_client.calls[0][2] == {"index": {"refresh_interval": "-1", "number_of_replicas": 0}}
+    # the original settings are restored
+    assert fake_client.data["records-new"]["settings"] == {"number_of_shards": "1", "number_of_replicas": "1"}
+
+    # the aliases are not switched if the index health is not reached
+    fake_client.status = "yellow"
+    res = runner.invoke(move_index, ["records", "records-new", "records-v3", "-b"])
+    assert res.exit_code == 4
+    assert fake_client.data["records-new"]["aliases"] == {"records": {}}
+    res = runner.invoke(move_batch, ["records", "-s", "-v4", "-b", "--wait-for-status", "yellow", "-n", "0"])
+    assert res.exit_code == 0, res.output
+    assert fake_client.data["records-record-v1.0.0-v4"]["aliases"] == {"records": {}}
+
+
+def test_move_catch_up(base_app, fake_client, monkeypatch):
+    """Test move index with catch-up passes."""
+    fake_client.add_index("records-old", "records")
+    reindex = fake_client.reindex
+
+    def reindex_with_writes(body, **kwargs):
+        """Reindex and write a document in the source index."""
+        res = reindex(body, **kwargs)
+        docs = fake_client.data[body["source"]["index"]]["docs"]
+        pid = str(len(docs))
+        docs[pid] = {"pid": pid, "_updated": index_module.utc_now().isoformat()}
+        return res
+
+    monkeypatch.setattr(fake_client, "reindex", reindex_with_writes)
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(
+        move_index,
+        ["records", "records-old", "records-new", "--catch-up", "--catch-up-threshold", "0", "--catch-up-passes", "2"],
+    )
+    assert res.exit_code == 0, res.output
+    # full reindex, 2 passes before the switch and a last one after it
+    queries = [call[1]["source"].get("query") for call in fake_client.calls if call[0] == "reindex"]
+    assert queries[0] is None
+    assert [list(query["range"]) for query in queries[1:]] == [["_updated"]] * 3
+    assert "Catch-up: 1 changed documents reindexed." in res.output
+    assert "Catch-up: 2 changed documents reindexed." in res.output
+    assert fake_client.data["records-new"]["aliases"] == {"records": {}}
+    # only the document written during the last pass is missing
+    assert len(fake_client.data["records-new"]["docs"]) == 6
+    assert len(fake_client.data["records-old"]["docs"]) == 7
+
+    # the switch does not wait for more passes if the delta is small
+    fake_client.calls.clear()
+    res = runner.invoke(move_batch, ["records", "-s", "-v2", "-n", "0", "--catch-up"])
+    assert res.exit_code == 0, res.output
+    assert len([call for call in fake_client.calls if call[0] == "reindex"]) == 3
+    assert fake_client.data["records-record-v1.0.0-v2"]["aliases"] == {"records": {}}
+    assert len(fake_client.data["records-record-v1.0.0-v2"]["docs"]) == 8
+
+
+def test_move_catch_up_conflicts(base_app, fake_client, monkeypatch):
+    """Test catch-up passes with documents updated in the new index."""
+    fake_client.add_index("records-old", "records")
+    switch = index_module.switch_aliases
+
+    def switch_with_writes(old, new):
+        """Switch and update a document in the new index."""
+        switch(old, new)
+        fake_client.data[old]["docs"]["1"] = {"pid": "1", "_version": 1, "_updated": index_module.utc_now().isoformat()}
+        fake_client.data[new]["docs"]["1"] = {"pid": "1", "_version": 2}
+
+    monkeypatch.setattr(index_module, "switch_aliases", switch_with_writes)
+    res = base_app.test_cli_runner().invoke(move_index, ["records", "records-old", "records-new", "--catch-up"])
+    assert res.exit_code == 0, res.output
+    bodies = [call[1] for call in fake_client.calls if call[0] == "reindex"]
+    assert "conflicts" not in bodies[0]
+    assert all(body["conflicts"] == "proceed" for body in bodies[1:])
+    # the newer document of the new index is kept
+    assert fake_client.data["records-new"]["docs"]["1"] == {"pid": "1", "_version": 2}
+
+
+def test_switch_index(base_app, fake_client):
+    """Test the atomic switch of the aliases."""
+    fake_client.add_index("records-old", "records")
+    fake_client.data["records-old"]["aliases"]["records-write"] = {"is_write_index": True, "index_routing": "1"}
+    fake_client.indices.create("records-new")
+    res = base_app.test_cli_runner().invoke(switch_index, ["records-old", "records-new"])
+    assert res.exit_code == 0, res.output
+    assert fake_client.calls == [
+        (
+            "update_aliases",
+            {
+                "actions": switch_actions("records-old", "records-new", "records")
+                + switch_actions("records-old", "records-new", "records-write", index_routing="1", is_write_index=True)
+            },
+        )
+    ]
+    assert fake_client.data["records-new"]["aliases"] == {
+        "records": {},
+        "records-write": {"index_routing": "1", "is_write_index": True},
+    }
+    assert fake_client.data["records-old"]["aliases"] == {}
+
+
+def test_update_mapping(base_app, fake_client, tmp_path):
+    """Test the concurrent mapping updates."""
+    mapping = tmp_path / "document.json"
+    settings = {"index": {"max_result_window": 100}}
+    mapping.write_text(json.dumps({"mappings": {"dynamic": "strict"}, "settings": settings}))
+    fake_client.indices.create("documents-document-v1.0.0")
+    with base_app.app_context():
+        current_search.aliases["documents"] = {"documents-document-v1.0.0": str(mapping)}
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(update_mapping, ["-w", "2"])
+    assert res.exit_code == 0, res.output
+    assert "index: records-record-v1.0.0 is up to date" in res.output
+    assert "index: documents-document-v1.0.0 has been successfully updated" in res.output
+    # no index is closed without the settings option
+    assert fake_client.calls == [("put_mapping", "documents-document-v1.0.0", {"dynamic": "strict"})]
+
+    fake_client.calls.clear()
+    res = runner.invoke(update_mapping, ["-s"])
+    assert res.exit_code == 0, res.output
+    # the mapping is already up to date
+    assert fake_client.calls == [
+        ("close", "documents-document-v1.0.0"),
+        ("put_settings", "documents-document-v1.0.0", settings),
+        ("open", "documents-document-v1.0.0"),
+    ]
+
+    # only the changes are sent
+    fake_client.data["documents-document-v1.0.0"]["body"]["mappings"]["properties"] = {}
+    fake_client.calls.clear()
+    res = runner.invoke(update_mapping, ["-s", "-a", "documents"])
+    assert res.exit_code == 0, res.output
+    assert "index: documents-document-v1.0.0 is up to date" in res.output
+    assert fake_client.calls == []
+
+    # the mapping is not updated if the settings update failed
+    fake_client.data["documents-document-v1.0.0"]["settings"]["max_result_window"] = "10"
+    fake_client.data["documents-document-v1.0.0"]["body"]["mappings"]["dynamic"] = "false"
+    fake_client.indices.put_settings = lambda index, body: 1 / 0
+    res = runner.invoke(update_mapping, ["-s", "-a", "documents"])
+    assert res.exit_code == 1
+    assert "error: division by zero" in res.output
+    assert fake_client.calls == [("close", "documents-document-v1.0.0"), ("open", "documents-document-v1.0.0")]
+
+    fake_client.calls.clear()
+    res = runner.invoke(update_mapping, ["-s", "-a", "documents", "--dry-run"])
+    assert res.exit_code == 0, res.output
+    assert 'mappings: [{"op": "replace", "path": "/dynamic", "value": "strict"}]' in res.output
+    assert 'settings: [{"op": "replace", "path": "/max_result_window", "value": "100"}]' in res.output
+    assert fake_client.calls == []
+
+
+def test_templates(base_app, fake_client, tmp_path, monkeypatch):
+    """Test the update of the changed templates."""
+    template = tmp_path / "records.json"
+    template.write_text(
+        json.dumps(
+            {
+                "index_patterns": "__SEARCH_INDEX_PREFIX__records-*",
+                "settings": {"number_of_shards": 1},
+                "mappings": {"date_detection": False},
+            }
+        )
+    )
+    state = base_app.extensions["invenio-search"]
+    monkeypatch.setattr(state, "templates", {"records": str(template)})
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(templates, ["--dry-run"])
+    assert res.exit_code == 0, res.output
+    assert "template records would be updated" in res.output
+    assert fake_client.calls == []
+
+    res = runner.invoke(templates)
+    assert res.exit_code == 0, res.output
+    assert fake_client.calls == [("put_template", "records")]
+    assert fake_client.templates["records"]["index_patterns"] == "records-*"
+
+    # the cluster returns the normalized template
+    fake_client.templates["records"] = {
+        "order": 0,
+        "index_patterns": ["records-*"],
+        "settings": {"index": {"number_of_shards": "1"}},
+        "mappings": {"date_detection": False},
+        "aliases": {},
+    }
+    fake_client.calls.clear()
+    res = runner.invoke(move_index, ["records", "records-old", "records-new", "-n", "0"])
+    assert "Templates did not changed." in res.output
+    assert ("put_template", "records") not in fake_client.calls
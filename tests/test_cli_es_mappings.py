@@ -0,0 +1,72 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test the mappings loading and comparison."""
+
+import json
+import os
+
+from rero_invenio_base.cli.es import mappings
+from rero_invenio_base.cli.es.mappings import (
+    additive_diff,
+    index_changes,
+    load_mapping,
+    normalize_settings,
+)
+
+
+def test_load_mapping(tmp_path, monkeypatch):
+    """Test the mapping files cache."""
+    path = tmp_path / "mapping.json"
+    path.write_text(json.dumps({"mappings": {"dynamic": "strict"}}))
+    loads = []
+    json_load = json.load
+    monkeypatch.setattr(mappings.json, "load", lambda fp: loads.append(fp.name) or json_load(fp))
+
+    mapping = load_mapping(str(path))
+    assert mapping == {"mappings": {"dynamic": "strict"}}
+    assert load_mapping(str(path)) is mapping
+    assert loads == [str(path)]
+
+    # a modified file is parsed again
+    path.write_text(json.dumps({"mappings": {}}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_mapping(str(path)) == {"mappings": {}}
+    assert len(loads) == 2
+
+
+def test_index_changes():
+    """Test the comparison of the mapping files with the live indices."""
+    assert normalize_settings({"index": {"number_of_shards": 1, "analysis": {"filter": ["a"]}}, "hidden": True}) == {
+        "number_of_shards": "1",
+        "analysis.filter": ["a"],
+        "hidden": "true",
+    }
+    # the live fields missing in the file are not changes
+    assert additive_diff({"properties": {"a": {}, "b": {}}}, {"properties": {"a": {}}}) == []
+    assert additive_diff({"properties": {"a": {}}}, {"properties": {"a": {}, "b": {}}}) == [
+        {"op": "add", "path": "/properties/b", "value": {}}
+    ]
+
+    local = {"mappings": {"properties": {"a": {"type": "keyword"}}}, "settings": {"max_result_window": 100}}
+    live = {
+        "mappings": {"properties": {"a": {"type": "keyword"}}},
+        "settings": {"index": {"max_result_window": "100", "uuid": "x"}},
+    }
+    assert index_changes(local, [live], settings=True) == {}
+    assert list(index_changes(local, None, settings=True)) == ["mappings", "settings"]
+    # the settings are compared only if requested
+    assert index_changes(local, [{"mappings": live["mappings"]}]) == {}
@@ -0,0 +1,221 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test cli elasticsearch task commands on a fake cluster."""
+
+import json
+
+import pytest
+from elasticsearch import TransportError
+
+from rero_invenio_base.cli.es.progress import TaskProgress, format_duration
+from rero_invenio_base.cli.es.task import task_list, task_watch
+from rero_invenio_base.cli.es.waiter import TaskWaiter
+
+
+def running(created, total=1000, updated=0):
+    """Get the tasks API response of a running reindex."""
+    return {
+        "completed": False,
+        "task": {
+            "description": "reindex from [old] to [new]",
+            "status": {"total": total, "created": created, "updated": updated},
+        },
+    }
+
+
+class FakeTasksClient:
+    """Tasks client returning the given responses."""
+
+    def __init__(self, responses):
+        """Init magic method."""
+        self.responses = list(responses)
+
+    def get(self, task_id, **kwargs):
+        """Get the next response of a task."""
+        if kwargs.get("wait_for_completion") and not self.responses[0].get("completed"):
+            raise TransportError(408, "timeout_exception")
+        return self.responses.pop(0)
+
+
+class FakeSearchClient:
+    """Minimal search client."""
+
+    def __init__(self, responses):
+        """Init magic method."""
+        self.tasks = FakeTasksClient(responses)
+
+    def info(self):
+        """Get the cluster info."""
+        return {"version": {"number": "7.10.2"}}
+
+
+@pytest.fixture()
+def fake_tasks(base_app):
+    """Replace the search client by a fake one returning given responses."""
+    state = base_app.extensions["invenio-search"]
+    original = state._client
+
+    def set_responses(*responses):
+        state._client = FakeSearchClient(responses)
+
+    yield set_responses
+    state._client = original
+
+
+def test_task_progress():
+    """Test the task progress estimation."""
+    progress = TaskProgress("node:1", window=10)
+    assert progress.rate is None
+    assert progress.update(running(0), now=progress.started).eta is None
+    progress.update(running(100, updated=100), now=progress.started + 2)
+    assert progress.rate == 100
+    assert progress.eta == 8
+    assert progress.percent == 20
+    assert progress.render() == "200/1000 (20.0%) 100 docs/s elapsed 0:00:02 ETA 0:00:08"
+
+    # the rate is computed in the sliding window
+    for second in range(3, 13):
+        progress.update(running(200 + (second - 2) * 10), now=progress.started + second)
+    assert progress.samples[0][0] == progress.started + 2
+    assert progress.rate == 10
+    assert progress.eta == 70
+
+    progress.update({"completed": True, "response": {"total": 1000, "created": 1000, "failures": []}})
+    assert progress.to_dict()["completed"]
+    assert progress.eta == 0
+    assert progress.percent == 100
+    assert format_duration(3725) == "1:02:05"
+    assert format_duration(None) == "-"
+
+
+def test_task_watch(base_app, fake_tasks):
+    """Test watch a task."""
+    completed = {"completed": True, "response": {"total": 1000, "created": 1000, "failures": []}}
+    runner = base_app.test_cli_runner()
+    fake_tasks(running(0), running(500), completed)
+    res = runner.invoke(task_watch, ["node:1"])
+    assert res.exit_code == 0, res.output
+    assert "reindex from [old] to [new]" in res.output
+    assert "500/1000 (50.0%)" in res.output
+    assert "Finished task: node:1" in res.output
+
+    fake_tasks(running(0), running(500), completed)
+    res = runner.invoke(task_watch, ["node:1", "--json"])
+    assert res.exit_code == 0, res.output
+    lines = [json.loads(line) for line in res.output.splitlines()]
+    assert [line["percent"] for line in lines] == [0, 50, 100]
+    assert lines[-1]["completed"]
+    assert lines[-1]["failures"] is None
+
+
+def test_task_waiter():
+    """Test wait for several tasks."""
+
+    class Tasks:
+        """Tasks completed after a number of requests."""
+
+        def __init__(self, **requests):
+            self.requests = requests
+            self.calls = []
+
+        def get(self, task_id, **kwargs):
+            self.calls.append((task_id, kwargs.get("timeout")))
+            self.requests[task_id] -= 1
+            if self.requests[task_id] > 0:
+                if kwargs.get("wait_for_completion"):
+                    raise TransportError(408, "timeout_exception")
+                return {"completed": False}
+            return {"completed": True}
+
+    class Client:
+        tasks = Tasks(short=2, long=9, added=1)
+
+    waiter = TaskWaiter(Client, ["long", "short"], max_interval=2)
+    completed = []
+    for task, res in waiter:
+        if res["completed"]:
+            completed.append(task)
+            if task == "short":
+                waiter.add("added")
+    assert completed == ["short", "added", "long"]
+    assert len(waiter) == 0
+    # the oldest task is waited for, the timeout is reset by each completion
+    timeouts = [(task, timeout) for task, timeout in Client.tasks.calls if timeout]
+    assert timeouts == [("long", "500ms"), ("long", "500ms"), ("long", "1000ms")]
+
+    # the wait timeout has a floor
+    Client.tasks = Tasks(long=4)
+    assert [res["completed"] for _, res in TaskWaiter(Client, ["long"], max_interval=0)] == [False, False, True]
+    assert [timeout for _, timeout in Client.tasks.calls if timeout] == ["500ms", "500ms"]
+
+
+def test_task_list(base_app, fake_tasks):
+    """Test the filtered and aggregated task list."""
+    tasks = [
+        {
+            "node": "node",
+            "id": 1,
+            "action": "indices:data/write/reindex",
+            "running_time_in_nanos": 10 * 10**9,
+            "description": "reindex from [old] to [new]",
+            "status": {"total": 1000, "created": 400, "updated": 100},
+        },
+        # a slice of the first task
+        {
+            "node": "node",
+            "id": 2,
+            "action": "indices:data/write/reindex",
+            "running_time_in_nanos": 5 * 10**9,
+            "parent_task_id": "node:1",
+            "status": {"total": 500, "created": 250},
+        },
+        {"node": "node", "id": 3, "action": "cluster:monitor/tasks/lists", "running_time_in_nanos": 10**6},
+    ]
+    fake_tasks()
+    client = base_app.extensions["invenio-search"]._client
+    calls = []
+
+    def list_tasks(**kwargs):
+        calls.append(kwargs)
+        return {"tasks": tasks}
+
+    client.tasks.list = list_tasks
+    runner = base_app.test_cli_runner()
+    res = runner.invoke(task_list, ["-a", "reindex", "-a", "*byquery", "-n", "node", "-p", "node:1", "-d"])
+    assert res.exit_code == 0, res.output
+    assert calls[-1] == {
+        "group_by": "none",
+        "actions": "indices:data/write/reindex,*byquery",
+        "nodes": "node",
+        "parent_task_id": "node:1",
+        "detailed": True,
+    }
+    assert "reindex from [old] to [new]" in res.output
+
+    res = runner.invoke(task_list, ["--json", "-t", "1"])
+    assert res.exit_code == 0, res.output
+    assert calls[-1] == {"group_by": "none"}
+    lines = [json.loads(line) for line in res.output.splitlines()]
+    assert [line["id"] for line in lines if line["type"] == "task"] == ["node:1", "node:2"]
+    assert lines[0]["docs_per_second"] == 50
+    assert lines[-1] == {
+        "type": "action",
+        "action": "indices:data/write/reindex",
+        "count": 1,
+        "running_time": 10,
+        "docs": 500,
+        "docs_per_second": 50,
+    }
@@ -0,0 +1,31 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export benchmark."""
+
+import pytest
+from benchmarks.export_benchmark import MODES, run_benchmark
+
+
+@pytest.mark.parametrize("mode", list(MODES))
+def test_export_benchmark(mode):
+    """Test export benchmark modes."""
+    measures = run_benchmark(mode, documents=2500, size=10)
+    assert measures["mode"] == mode
+    assert measures["documents"] == 2500
+    assert not measures["aborted"]
+    assert measures["bytes"] > 2500 * 10
+    assert measures["time_to_first_byte"] <= measures["duration"]
+    assert measures["peak_rss"] > 0
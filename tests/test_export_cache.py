@@ -0,0 +1,110 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export results cache."""
+
+import os
+from unittest import mock
+
+from elasticsearch_dsl import Search
+
+from rero_invenio_base.modules.export.cache import (
+    FileSystemExportCache,
+    export_cache_key,
+    index_generation,
+)
+
+
+class StatsClient:
+    """Minimal search client returning shard level stats."""
+
+    def __init__(self):
+        """Init magic method."""
+        self.max_seq_no = 10
+
+    def stats(self, index, metric, level):
+        """Get the index stats."""
+        return {
+            "indices": {
+                "records-v1": {
+                    "uuid": "abc",
+                    "shards": {
+                        "0": [
+                            {
+                                "routing": {"primary": True},
+                                "seq_no": {"max_seq_no": self.max_seq_no},
+                                "refresh": {"total": 3},
+                            },
+                            {"routing": {"primary": False}, "seq_no": {"max_seq_no": 1}, "refresh": {"total": 1}},
+                        ]
+                    },
+                }
+            }
+        }
+
+    @property
+    def indices(self):
+        """Indices client."""
+        return self
+
+
+def test_export_cache_key():
+    """Test export cache keys."""
+    client = StatsClient()
+    search = Search(using=client, index="records").query("match", title="foo")
+    assert index_generation(search) == [["records-v1", "abc", "0", 10, 3]]
+    key = export_cache_key(search, "text/csv")
+    assert key == export_cache_key(search, "text/csv")
+    assert key != export_cache_key(search, "application/json")
+    assert key != export_cache_key(search.query("match", title="bar"), "text/csv")
+    # the user preference does not change the results
+    assert key == export_cache_key(search.params(preference="user1"), "text/csv")
+    assert key != export_cache_key(search.params(version=True), "text/csv")
+    client.max_seq_no = 11
+    assert key != export_cache_key(search, "text/csv")
+
+
+def test_file_system_export_cache(base_app, tmp_path):
+    """Test file system export cache."""
+    with base_app.app_context():
+        cache = FileSystemExportCache(directory=tmp_path, max_size=45)
+    assert cache.get("foo") is None
+
+    # partially consumed responses are not stored
+    chunks = cache.store("foo", iter(["01234", "56789"]), [("Content-Type", "text/csv")])
+    next(chunks)
+    chunks.close()
+    assert cache.get("foo") is None
+    assert not list(tmp_path.iterdir())
+
+    headers = [("Content-Type", "text/csv"), ("Content-Encoding", "gzip"), ("Set-Cookie", "session=foo")]
+    assert list(cache.store("foo", iter(["01234", b"5678"]), headers)) == [b"01234", b"5678"]
+    headers, content = cache.get("foo")
+    assert headers == [["Content-Type", "text/csv"]]
+    assert b"".join(content) == b"012345678"
+    os.utime(tmp_path / "foo.export", (0, 0))
+
+    # the least recently used entries are evicted
+    list(cache.store("bar", iter(["0123"]), []))
+    assert cache.get("foo") is None
+    assert cache.get("bar")
+
+    # the entries evicted by another process once opened are still read
+    with mock.patch("os.utime", side_effect=FileNotFoundError):
+        _, content = cache.get("bar")
+    assert b"".join(content) == b"0123"
+
+    cache.clear()
+    assert cache.get("bar") is None
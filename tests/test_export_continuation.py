@@ -0,0 +1,54 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export continuation tokens."""
+
+import pytest
+from elasticsearch_dsl.response import Hit
+from werkzeug.exceptions import BadRequest
+
+from rero_invenio_base.modules.export.continuation import ExportContinuation
+
+
+def test_continuation_tokens(base_app):
+    """Test continuation tokens creation and validation."""
+    with base_app.test_request_context("/export/records/?q=title:foo&continuation=bar"):
+        continuation = ExportContinuation.from_request()
+        token = continuation.dumps(["pid-1", 42])
+        assert continuation.loads(token) == ["pid-1", 42]
+        with pytest.raises(BadRequest):
+            continuation.loads(f"{token}x")
+
+    # the continuation arg is not part of the query fingerprint
+    with base_app.test_request_context(f"/export/records/?q=title:foo&continuation={token}"):
+        assert ExportContinuation.from_request().loads(token) == ["pid-1", 42]
+
+    # the token can not be used for another query
+    with base_app.test_request_context("/export/records/?q=title:bar"), pytest.raises(BadRequest):
+        ExportContinuation.from_request().loads(token)
+
+
+def test_continuation_checkpoints(base_app):
+    """Test continuation tokens attached to the hits."""
+    hits = [Hit({"_id": str(pid), "_source": {}, "sort": [pid]}) for pid in range(10)]
+    with base_app.test_request_context("/export/records/"):
+        continuation = ExportContinuation.from_request()
+        tokens = {
+            hit.meta.id: hit.meta.continuation
+            for hit in continuation.checkpoints(iter(hits), 4)
+            if "continuation" in hit.meta
+        }
+        assert tokens.keys() == {"3", "7"}
+        assert continuation.loads(tokens["7"]) == [7]
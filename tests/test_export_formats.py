@@ -0,0 +1,127 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export built-in formats."""
+
+import io
+import json
+
+import pytest
+from elasticsearch_dsl.response import Hit
+
+from rero_invenio_base.modules.export import formats
+from rero_invenio_base.modules.export.formats import (
+    ArrowSerializer,
+    NDJSONSerializer,
+)
+from rero_invenio_base.modules.export.iterators import BatchedHits
+
+hits = [
+    {"pid": "1", "title": "Le Petit Prince", "provision": {"date": 1943}},
+    {"pid": "2", "title": "Vol de nuit"},
+    {"pid": "3", "title": "Terre des hommes", "provision": {"date": 1939}},
+]
+
+
+@pytest.mark.parametrize("orjson", [formats.orjson, None])
+def test_ndjson_serializer(orjson, monkeypatch):
+    """Test NDJSON serializer."""
+    monkeypatch.setattr(formats, "orjson", orjson)
+    serializer = NDJSONSerializer(batch_size=2)
+    chunks = list(serializer.serialize_search(None, iter(hits)))
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in b"".join(chunks).splitlines()] == hits
+
+    serializer = NDJSONSerializer(fields=["pid", "provision.date"])
+    assert serializer.source_includes == ["pid", "provision.date"]
+    chunks = list(serializer.serialize_search(None, BatchedHits(iter(hits), 3)))
+    assert chunks == [
+        b'{"pid":"1","provision.date":1943}\n{"pid":"2","provision.date":null}\n{"pid":"3","provision.date":1939}\n'
+    ]
+
+
+def checkpoint_hits():
+    """Get search hits with a continuation token on the second one."""
+    search_hits = [Hit({"_id": source["pid"], "_source": source}) for source in hits]
+    search_hits[1].meta.continuation = "token-2"
+    return search_hits
+
+
+def test_ndjson_serializer_continuation():
+    """Test NDJSON continuation tokens control records."""
+    serializer = NDJSONSerializer(fields=["pid"])
+    data = b"".join(serializer.serialize_search(None, iter(checkpoint_hits())))
+    assert [json.loads(line) for line in data.splitlines()] == [
+        {"pid": "1"},
+        {"pid": "2"},
+        {"_continuation": "token-2"},
+        {"pid": "3"},
+    ]
+
+
+def test_arrow_serializer_continuation():
+    """Test Arrow IPC continuation tokens metadata."""
+    pytest.importorskip("pyarrow")
+    pyarrow = formats.pyarrow
+    serializer = ArrowSerializer(fields=["pid"])
+    reader = pyarrow.ipc.open_stream(b"".join(serializer.serialize_search(None, iter(checkpoint_hits()))))
+    # the record batch is split after the hit of the token
+    batch, metadata = reader.read_next_batch_with_custom_metadata()
+    assert batch.to_pydict() == {"pid": ["1", "2"]}
+    assert metadata[b"_continuation"] == b"token-2"
+    batch, metadata = reader.read_next_batch_with_custom_metadata()
+    assert batch.to_pydict() == {"pid": ["3"]}
+    assert metadata is None
+
+
+@pytest.mark.parametrize("file_format", ["ipc", "parquet"])
+def test_arrow_serializer(file_format):
+    """Test Arrow IPC and Parquet serializers."""
+    pytest.importorskip("pyarrow")
+    # the parquet module is imported with the formats
+    pyarrow = formats.pyarrow
+
+    def read(data):
+        if file_format == "parquet":
+            return pyarrow.parquet.read_table(io.BytesIO(data))
+        return pyarrow.ipc.open_stream(data).read_all()
+
+    serializer = ArrowSerializer(fields=["pid", "provision.date"], batch_size=2, file_format=file_format)
+    table = read(b"".join(serializer.serialize_search(None, iter(hits))))
+    assert table.to_pydict() == {"pid": ["1", "2", "3"], "provision.date": ["1943", None, "1939"]}
+    assert table.num_rows == 3
+
+    # the types are not inferred from the first batch without the date
+    serializer = ArrowSerializer(fields=["pid", "provision.date"], batch_size=1, file_format=file_format)
+    table = read(b"".join(serializer.serialize_search(None, iter([*hits[1:], {"pid": 4, "provision": "1940"}]))))
+    assert table.to_pydict() == {"pid": ["2", "3", "4"], "provision.date": [None, "1939", None]}
+    serializer = ArrowSerializer(fields=["pid", "provision"], batch_size=1, file_format=file_format)
+    table = read(b"".join(serializer.serialize_search(None, iter([hits[2], {"pid": "4", "provision": "1940"}]))))
+    assert table.to_pydict() == {"pid": ["3", "4"], "provision": ['{"date":1939}', "1940"]}
+
+    schema = pyarrow.schema([("pid", pyarrow.string()), ("title", pyarrow.string())])
+    serializer = ArrowSerializer(schema=schema, file_format=file_format)
+    assert serializer.source_includes == ["pid", "title"]
+    table = read(b"".join(serializer.serialize_search(None, iter(hits))))
+    assert table.schema == schema
+
+    # the columns can not be inferred before the first batch is written
+    with pytest.raises(AssertionError):
+        ArrowSerializer(file_format=file_format)
+
+    # no hits
+    serializer = ArrowSerializer(fields=["pid"], file_format=file_format)
+    table = read(b"".join(serializer.serialize_search(None, iter([]))))
+    assert table.num_rows == 0
@@ -0,0 +1,194 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export search iterators."""
+
+import pytest
+from elasticsearch_dsl import Search
+from flask import current_app
+from werkzeug.local import LocalProxy
+
+from rero_invenio_base.modules.export.iterators import (
+    point_in_time_scan,
+    scan,
+    sliced_scan,
+)
+
+
+class SlicedSearch:
+    """Minimal search object supporting sliced scans."""
+
+    _using = None
+
+    def __init__(self, hits, slice_=None, fail=False):
+        """Init magic method."""
+        self.hits = hits
+        self.slice = slice_
+        self.fail = fail
+        self.closed = []
+
+    def using(self, client):
+        """Set the search client."""
+        return self
+
+    def extra(self, **kwargs):
+        """Set the slice of the search."""
+        search = SlicedSearch(self.hits, kwargs.get("slice"), self.fail)
+        search.closed = self.closed
+        return search
+
+    def scan(self):
+        """Iterate over the hits of the current slice."""
+        try:
+            for hit in self.hits:
+                if self.slice and hit % self.slice["max"] != self.slice["id"]:
+                    continue
+                if self.fail:
+                    raise ValueError(hit)
+                yield hit
+        finally:
+            self.closed.append(self.slice)
+
+
+class ScrollClient:
+    """Minimal search client supporting scrolls."""
+
+    def __init__(self, pages):
+        """Init magic method."""
+        self.pages = pages
+        self.cleared = []
+
+    def page(self):
+        """Get the next page."""
+        hits = [{"_index": "records", "_id": str(pid), "_source": {"pid": pid}} for pid in self.pages.pop(0)]
+        return {"_scroll_id": "scroll-1", "_shards": {"total": 1, "successful": 1}, "hits": {"hits": hits}}
+
+    def search(self, body=None, **kwargs):
+        """Open a scroll."""
+        return self.page()
+
+    def scroll(self, body=None, **kwargs):
+        """Get the next scroll page."""
+        return self.page()
+
+    def clear_scroll(self, body=None, **kwargs):
+        """Clear scrolls."""
+        self.cleared.extend(body["scroll_id"])
+
+
+class PointInTimeClient:
+    """Minimal search client supporting point in time searches."""
+
+    def __init__(self, pids):
+        """Init magic method."""
+        self.pids = pids
+        self.opened = []
+        self.closed = []
+        self.bodies = []
+
+    def open_point_in_time(self, index, keep_alive):
+        """Open a point in time."""
+        self.opened.append(index)
+        return {"id": f"pit-{len(self.opened)}"}
+
+    def close_point_in_time(self, body):
+        """Close a point in time."""
+        self.closed.append(body["id"])
+
+    def search(self, index=None, body=None, **params):
+        """Search the next page sorted by pid."""
+        assert index is None
+        assert params.get("preference") is None
+        self.bodies.append(body)
+        after = body.get("search_after", [-1])[0]
+        pids = [pid for pid in self.pids if pid > after][: body["size"]]
+        return {
+            "pit_id": body["pit"]["id"],
+            "hits": {
+                "hits": [
+                    {"_index": "records", "_id": str(pid), "_source": {"pid": pid}, "sort": [pid, pid]} for pid in pids
+                ]
+            },
+        }
+
+
+def test_scan():
+    """Test single cursor scan."""
+    search = SlicedSearch(range(10))
+    assert list(scan(search)) == list(range(10))
+    assert list(sliced_scan(search, slices=1)) == list(range(10))
+
+
+def test_scan_close(base_app):
+    """Test scroll cleared when the scan is closed."""
+    client = base_app.extensions["scroll-client"] = ScrollClient([[1, 2], [3, 4], []])
+    search = Search(using=LocalProxy(lambda: current_app.extensions["scroll-client"]), index="records")
+    with base_app.app_context():
+        hits = scan(search)
+        assert next(hits).pid == 1
+    # the response is closed by the WSGI server outside of the context
+    hits.close()
+    assert client.cleared == ["scroll-1"]
+
+
+def test_sliced_scan(appctx):
+    """Test concurrent sliced scan."""
+    search = SlicedSearch(range(1000))
+    hits = sliced_scan(search, slices=4, max_workers=2, buffer_size=5)
+    assert sorted(hits) == list(range(1000))
+    assert len(search.closed) == 4
+
+    # stop the iteration before the end
+    search = SlicedSearch(range(1000))
+    hits = sliced_scan(search, slices=4, buffer_size=5)
+    assert len([next(hits) for _ in range(10)]) == 10
+    hits.close()
+
+    # errors are raised in the consumer
+    hits = sliced_scan(SlicedSearch(range(10), fail=True), slices=2)
+    with pytest.raises(ValueError):
+        list(hits)
+
+
+def test_point_in_time_scan():
+    """Test point in time and search after scan."""
+    client = PointInTimeClient(list(range(25)))
+    search = Search(using=client, index="records").params(preference="foo")
+    search.aggs.bucket("types", "terms", field="type")
+    hits = point_in_time_scan(search, size=10)
+    assert [hit.pid for hit in hits] == list(range(25))
+    # the facets are not computed for each page
+    assert all("aggs" not in body for body in client.bodies)
+    assert search.to_dict()["aggs"]
+    assert client.opened == [["records"]]
+    assert client.closed == ["pit-1"]
+    assert len(client.bodies) == 3
+    assert client.bodies[0]["sort"] == ["pid", "_shard_doc"]
+    assert client.bodies[1]["search_after"] == [9, 9]
+
+    # resume after a given sort key
+    client = PointInTimeClient(list(range(25)))
+    search = Search(using=client, index="records").sort("-date")
+    hits = point_in_time_scan(search, size=10, search_after=[19, 19])
+    assert [hit.pid for hit in hits] == list(range(20, 25))
+    assert client.bodies[0]["sort"] == [{"date": {"order": "desc"}}, "pid", "_shard_doc"]
+
+    # the point in time is closed when the iteration is stopped
+    client = PointInTimeClient(list(range(25)))
+    hits = point_in_time_scan(Search(using=client, index="records"), size=10)
+    next(hits)
+    assert not client.closed
+    hits.close()
+    assert client.closed == ["pit-1"]
@@ -0,0 +1,63 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export concurrency limiters."""
+
+import pytest
+
+from rero_invenio_base.modules.export.limiter import RedisExportLimiter
+
+
+@pytest.fixture()
+def redis_limiter(base_app):
+    """Shared limiter using the local Redis server."""
+    redis = pytest.importorskip("redis")
+    with base_app.app_context():
+        limiter = RedisExportLimiter(url="redis://localhost:6379/15", lease=60)
+    try:
+        limiter.client.ping()
+    except redis.ConnectionError:
+        pytest.skip("Redis server is not available.")
+    limiter.client.delete(*limiter._keys("records"), *limiter._keys("documents"))
+    yield limiter
+    limiter.client.delete(*limiter._keys("records"), *limiter._keys("documents"))
+
+
+def test_redis_export_limiter(base_app, redis_limiter):
+    """Test limits shared by all the processes."""
+    # another process of the same server
+    with base_app.app_context():
+        other = RedisExportLimiter(url="redis://localhost:6379/15", lease=60)
+    slot = redis_limiter.acquire("records", limit=1, global_limit=2)
+    assert slot
+    assert other.acquire("records", limit=1, global_limit=2) is None
+    other_slot = other.acquire("documents", limit=1, global_limit=2)
+    assert other_slot
+    # the global limit is reached
+    assert other.acquire("other", global_limit=2) is None
+
+    redis_limiter.release("records", slot, aborted=True)
+    assert redis_limiter.running["records"] == 0
+    assert redis_limiter.aborted["records"] == 1
+    assert other.acquire("records", limit=1, global_limit=2)
+
+    # the waiting requests get no slot before the timeout
+    assert redis_limiter.acquire("documents", limit=1, timeout=0.5) is None
+
+    # the slots of the killed processes expire
+    other.release("documents", other_slot)
+    other.lease = -1
+    assert other.acquire("documents", limit=1)
+    assert redis_limiter.acquire("documents", limit=1)
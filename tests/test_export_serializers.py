@@ -0,0 +1,49 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export stream serializers."""
+
+from rero_invenio_base.modules.export.iterators import BatchedHits
+from rero_invenio_base.modules.export.serializers import (
+    BatchSerializerMixin,
+    stream_search_responsify,
+)
+
+
+class BatchSerializer(BatchSerializerMixin):
+    """Serializer writing one line per batch."""
+
+    batch_size = 3
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Serialize a batch of hits."""
+        return ",".join(str(hit) for hit in hits) + "\n"
+
+
+def test_batch_serializer(base_app):
+    """Test batch serializer and streamed response."""
+    serializer = BatchSerializer()
+    assert list(serializer.serialize_search(None, iter(range(7)))) == ["0,1,2\n", "3,4,5\n", "6\n"]
+    hits = BatchedHits(iter(range(7)), 4)
+    assert list(hits.batches()) == [(0, 1, 2, 3), (4, 5, 6)]
+    assert list(serializer.serialize_search(None, BatchedHits(iter(range(7)), 4))) == ["0,1,2,3\n", "4,5,6\n"]
+
+    view = stream_search_responsify(serializer, "text/plain")
+    with base_app.test_request_context("/export/records/"):
+        response = view(None, BatchedHits(iter(range(5)), 5), headers={"X-Foo": "bar"})
+        assert response.is_streamed
+        assert response.mimetype == "text/plain"
+        assert response.headers["X-Foo"] == "bar"
+        assert response.get_data(as_text=True) == "0,1,2,3,4\n"
@@ -0,0 +1,459 @@
+# RERO Invenio Base
+# Copyright (C) 2026 RERO.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see <http://www.gnu.org/licenses/>.
+
+"""Test export views."""
+
+import contextlib
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch_dsl.response import Hit
+
+from rero_invenio_base.modules.export import jobs
+from rero_invenio_base.modules.export.formats import ndjson_stream_search
+from rero_invenio_base.modules.export.metrics import prometheus_metrics
+from rero_invenio_base.modules.export.serializers import (
+    BatchSerializerMixin,
+    stream_search_responsify,
+)
+from rero_invenio_base.modules.export.signals import export_finished
+from rero_invenio_base.modules.export.tasks import clean_export_jobs, export_job
+from rero_invenio_base.modules.export.views import create_blueprint_from_app
+
+source_includes = []
+"""Source includes of the executed searches."""
+
+scans = []
+"""Number of hits of the executed scans."""
+
+preferences = count()
+"""Per request search preferences."""
+
+
+class FakeSearch:
+    """Search class returning generated hits."""
+
+    _using = None
+
+    def __init__(self, hits=10):
+        """Init magic method."""
+        self.hits = hits
+        self._params = {}
+
+    def with_preference_param(self):
+        """Set the search preference."""
+        self._params["preference"] = next(preferences)
+        return self
+
+    def params(self, **kwargs):
+        """Set the search params."""
+        return self
+
+    def using(self, client):
+        """Set the search client."""
+        return self
+
+    def source(self, includes=None):
+        """Set the source includes."""
+        source_includes.append(includes)
+        return self
+
+    def count(self):
+        """Count the hits."""
+        return self.hits
+
+    def to_dict(self):
+        """Get the search body."""
+        return {"query": {"match_all": {}}}
+
+    def scan(self):
+        """Iterate over the hits."""
+        scans.append(self.hits)
+        yield from range(self.hits)
+
+
+class LineSerializer(BatchSerializerMixin):
+    """Serializer writing one line per batch."""
+
+    source_includes = ("pid",)
+
+    def serialize_batch(self, pid_fetcher, hits):
+        """Serialize a batch of hits."""
+        return ",".join(str(hit) for hit in hits) + "\n"
+
+
+def create_export_app(create_app, **config):
+    """Create an application with a records export endpoint."""
+    app = create_app()
+    app.config["RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS"] = {
+        "records": {
+            "resource": {
+                "list_route": "/records/",
+                "pid_fetcher": "recid",
+                "search_class": FakeSearch,
+                "search_factory_imp": lambda view, search: (search, {}),
+                "list_permission_factory_imp": "invenio_records_rest.utils:allow_all",
+            },
+            "default_media_type": "text/plain",
+            "search_serializers": {
+                "text/plain": stream_search_responsify(LineSerializer(), "text/plain"),
+            },
+            **config,
+        }
+    }
+    app.register_blueprint(create_blueprint_from_app(app))
+    return app
+
+
+def test_export_view(create_app):
+    """Test export view."""
+    app = create_export_app(create_app, search_batch_size=4)
+    with app.test_client() as client:
+        source_includes.clear()
+        res = client.get("/export/records/")
+        assert res.status_code == 200
+        assert res.get_data(as_text=True) == "0,1,2,3\n4,5,6,7\n8,9\n"
+        # source fields declared by the serializer
+        assert source_includes == [("pid",)]
+
+    app = create_export_app(create_app, search_source_includes=["pid", "title"])
+    with app.test_client() as client:
+        source_includes.clear()
+        res = client.get("/export/records/")
+        assert res.get_data(as_text=True) == "0,1,2,3,4,5,6,7,8,9\n"
+        assert source_includes == [["pid", "title"]]
+        # continuation tokens are not enabled
+        res = client.get("/export/records/?continuation=foo")
+        assert res.status_code == 400
+
+
+def test_export_view_compression(create_app):
+    """Test export view compressed responses."""
+    app = create_export_app(create_app)
+    with app.test_client() as client:
+        res = client.get("/export/records/", headers={"Accept-Encoding": "gzip"})
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in res.headers["Vary"]
+        assert gzip.decompress(res.data) == b"0,1,2,3,4,5,6,7,8,9\n"
+
+        res = client.get("/export/records/", headers={"Accept-Encoding": "br"})
+        assert "Content-Encoding" not in res.headers
+        assert res.data == b"0,1,2,3,4,5,6,7,8,9\n"
+
+    app.config["RERO_INVENIO_BASE_EXPORT_COMPRESSION"] = {}
+    with app.test_client() as client:
+        res = client.get("/export/records/", headers={"Accept-Encoding": "gzip"})
+        assert "Content-Encoding" not in res.headers
+
+
+def test_export_view_continuation(create_app):
+    """Test export resumed from a continuation token of the response."""
+
+    def sorted_scan(search, search_after=None):
+        """Iterate over the hits sorted by pid."""
+        start = search_after[0] + 1 if search_after else 0
+        for pid in range(start, search.hits):
+            yield Hit({"_id": str(pid), "_source": {"pid": pid}, "sort": [pid]})
+
+    app = create_export_app(
+        create_app,
+        search_iterator_imp=sorted_scan,
+        search_batch_size=3,
+        continuation_checkpoint=4,
+        default_media_type="application/x-ndjson",
+        search_serializers={"application/x-ndjson": ndjson_stream_search},
+    )
+    app.config["SECRET_KEY"] = "secret"
+    client = app.test_client()
+    records = [json.loads(line) for line in client.get("/export/records/?q=foo").data.splitlines()]
+    tokens = [record["_continuation"] for record in records if "_continuation" in record]
+    assert len(tokens) == 2
+    assert [record["pid"] for record in records if "pid" in record] == list(range(10))
+    # the client got the records up to the last token
+    assert records.index({"_continuation": tokens[-1]}) == records.index({"pid": 7}) + 1
+
+    res = client.get(f"/export/records/?q=foo&continuation={tokens[-1]}")
+    assert [json.loads(line) for line in res.data.splitlines()] == [{"pid": 8}, {"pid": 9}]
+    # the token is bound to the export query
+    assert client.get(f"/export/records/?q=bar&continuation={tokens[-1]}").status_code == 400
+
+
+def test_export_view_cache(create_app, tmp_path, monkeypatch):
+    """Test export view served from the cache."""
+    monkeypatch.setattr("rero_invenio_base.modules.export.cache.index_generation", lambda search: [])
+    app = create_export_app(create_app, export_cache=True)
+    app.config["RERO_INVENIO_BASE_EXPORT_CACHE_DIR"] = str(tmp_path)
+    with app.test_client() as client:
+        scans.clear()
+        res = client.get("/export/records/")
+        assert res.get_data(as_text=True) == "0,1,2,3,4,5,6,7,8,9\n"
+        res = client.get("/export/records/")
+        assert res.get_data(as_text=True) == "0,1,2,3,4,5,6,7,8,9\n"
+        assert res.mimetype == "text/plain"
+        # the second response has not been searched
+        assert len(scans) == 1
+
+
+def test_export_view_cache_headers(create_app, tmp_path, monkeypatch):
+    """Test export view cached headers."""
+    monkeypatch.setattr("rero_invenio_base.modules.export.cache.index_generation", lambda search: [])
+    app = create_export_app(create_app, export_cache=True)
+    app.config["RERO_INVENIO_BASE_EXPORT_CACHE_DIR"] = str(tmp_path)
+
+    @app.after_request
+    def set_cookie(response):
+        response.set_cookie("session", "user1")
+        return response
+
+    with app.test_client() as client:
+        scans.clear()
+        res = client.get("/export/records/", headers={"Accept-Encoding": "gzip"})
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(res.data) == b"0,1,2,3,4,5,6,7,8,9\n"
+
+    app.after_request_funcs[None].remove(set_cookie)
+    with app.test_client() as client:
+        res = client.get("/export/records/")
+        # served from the cache without the compression and cookie headers
+        assert len(scans) == 1
+        assert "Content-Encoding" not in res.headers
+        assert "Set-Cookie" not in res.headers
+        assert res.mimetype == "text/plain"
+        assert res.data == b"0,1,2,3,4,5,6,7,8,9\n"
+
+
+def test_export_jobs(create_app, tmp_path, monkeypatch):
+    """Test asynchronous export jobs."""
+    monkeypatch.setattr(export_job, "delay", lambda *args: export_job(*args))
+    app = create_export_app(create_app, export_jobs=True)
+    app.config["RERO_INVENIO_BASE_EXPORT_JOBS_DIR"] = str(tmp_path)
+    with app.test_client() as client:
+        res = client.post("/export/records/jobs/?q=foo")
+        assert res.status_code == 202
+        job = res.json
+        # the job has been run synchronously
+        assert job["state"] == "SUCCESS"
+        assert res.headers["Location"] == job["links"]["self"]
+
+        res = client.get(job["links"]["self"])
+        assert res.status_code == 200
+        assert res.json["state"] == "SUCCESS"
+        assert res.json["documents"] == res.json["total"] == 10
+
+        res = client.get(res.json["links"]["download"])
+        assert res.status_code == 200
+        assert res.mimetype == "text/plain"
+        assert res.get_data(as_text=True) == "0,1,2,3,4,5,6,7,8,9\n"
+        assert "attachment" in res.headers["Content-Disposition"]
+
+        assert client.get("/export/records/jobs/foo").status_code == 404
+        assert client.post("/export/records/jobs/", headers={"Accept": "text/csv"}).status_code == 406
+
+        with app.app_context():
+            assert clean_export_jobs(max_age=3600) == 0
+            assert clean_export_jobs(max_age=-1) == 1
+        assert client.get(job["links"]["self"]).status_code == 404
+
+
+def test_export_jobs_owner(create_app, tmp_path, monkeypatch):
+    """Test asynchronous export jobs owned by a user."""
+    users = {"1": SimpleNamespace(id="1"), "2": SimpleNamespace(id="2")}
+    current = SimpleNamespace(user=None)
+    exported_by = []
+
+    class CurrentUser:
+        """Current user proxy."""
+
+        @property
+        def is_authenticated(self):
+            """Check if a user is logged in."""
+            return current.user is not None
+
+        def get_id(self):
+            """Get the logged in user id."""
+            return current.user.id
+
+    def search_factory(view, search):
+        """Record the user running the export."""
+        exported_by.append(jobs.current_user_id())
+        return search, {}
+
+    def delay(*args):
+        """Run the job as a worker."""
+        # the worker has no logged in user
+        current.user = None
+        with contextlib.suppress(ValueError):
+            export_job(*args)
+
+    monkeypatch.setattr(jobs, "current_user", CurrentUser())
+    monkeypatch.setattr(jobs, "current_datastore", SimpleNamespace(get_user=users.get))
+    monkeypatch.setattr(jobs, "login_user", lambda user: setattr(current, "user", user))
+    monkeypatch.setattr(export_job, "delay", delay)
+    app = create_export_app(create_app, export_jobs=True)
+    app.config["RERO_INVENIO_BASE_EXPORT_JOBS_DIR"] = str(tmp_path)
+    app.config["RERO_INVENIO_BASE_EXPORT_REST_ENDPOINTS"]["records"]["resource"]["search_factory_imp"] = search_factory
+    app.login_manager = None
+    with app.test_client() as client:
+        current.user = users["1"]
+        res = client.post("/export/records/jobs/")
+        assert res.status_code == 202
+        job = res.json
+        assert job["owner"] == "1"
+        # the export has been run as the job owner
+        assert exported_by == ["1"]
+
+        current.user = users["1"]
+        assert client.get(job["links"]["self"]).status_code == 200
+        # the other users can not get the job
+        current.user = users["2"]
+        assert client.get(job["links"]["self"]).status_code == 404
+        assert client.get(f"{job['links']['self']}/download").status_code == 404
+        current.user = None
+        assert client.get(job["links"]["self"]).status_code == 404
+
+        # the jobs of deleted users fail
+        current.user = users.pop("1")
+        res = client.post("/export/records/jobs/")
+        current.user = users["1"] = SimpleNamespace(id="1")
+        assert client.get(res.json["links"]["self"]).json["state"] == "FAILURE"
+
+
+def test_export_view_limiter(create_app, caplog):
+    """Test export view concurrency limit."""
+    app = create_export_app(create_app, max_concurrent_exports=1)
+    client = app.test_client()
+    # the first export is running until its response is closed
+    running = client.get("/export/records/", buffered=False)
+    assert running.status_code == 200
+    res = client.get("/export/records/")
+    assert res.status_code == 429
+    assert res.headers["Retry-After"] == "30"
+    running.close()
+    assert client.get("/export/records/").status_code == 200
+
+    app = create_export_app(create_app)
+    app.config["RERO_INVENIO_BASE_EXPORT_MAX_CONCURRENT"] = 0
+    with app.test_client() as client:
+        assert client.get("/export/records/").status_code == 429
+
+    # the process limits can not be enforced by single-threaded processes
+    app = create_export_app(create_app, max_concurrent_exports=1)
+    sync_worker = {"wsgi.multiprocess": True, "wsgi.multithread": False}
+    client = app.test_client()
+    for _ in range(2):
+        res = client.get("/export/records/", environ_overrides=sync_worker)
+        assert res.status_code == 200
+        res.close()
+    # the error is logged once
+    assert [record.message for record in caplog.records].count(
+        "ExportLimiter counts the exports of one process and can not limit the exports of a multi-process server,"
+        " use RedisExportLimiter."
+    ) == 1
+
+
+def test_export_view_metrics(create_app):
+    """Test export view metrics."""
+    app = create_export_app(create_app, search_batch_size=4)
+    measures = []
+
+    def receiver(sender, metrics, **kwargs):
+        measures.append(metrics.to_dict())
+
+    client = app.test_client()
+    with export_finished.connected_to(receiver, sender=app):
+        client.get("/export/records/", buffered=True)
+        # the client closes the connection before the end of the export
+        res = client.get("/export/records/", buffered=False)
+        next(res.response)
+        res.close()
+
+    completed, aborted = measures
+    assert completed["endpoint"] == "api_exports.records_export"
+    assert completed["documents"] == 10
+    assert completed["bytes"] == len("0,1,2,3\n4,5,6,7\n8,9\n")
+    assert completed["time_to_first_byte"] <= completed["duration"]
+    assert not completed["aborted"]
+    assert aborted["documents"] == 4
+    assert aborted["aborted"]
+
+
+def test_export_prometheus_metrics():
+    """Test export metrics recorded by concurrent exports."""
+    prometheus_client = pytest.importorskip("prometheus_client")
+    metrics = SimpleNamespace(
+        endpoint="concurrent_export",
+        time_to_first_byte=0.1,
+        duration=1.0,
+        fetch_time=0.5,
+        serialization_time=0.4,
+        documents=10,
+        bytes=100,
+        aborted=False,
+    )
+    # the collectors are registered once by the exports finishing at once
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: prometheus_metrics(None, metrics=metrics), range(32)))
+    registry = prometheus_client.REGISTRY
+    assert registry.get_sample_value("rero_export_documents_total", {"endpoint": "concurrent_export"}) == 320
+    assert registry.get_sample_value("rero_export_duration_seconds_count", {"endpoint": "concurrent_export"}) == 32
+
+
+def test_export_view_lazy_serializers(create_app):
+    """Test export view serializers imported on first use."""
+    app = create_export_app(
+        create_app,
+        search_serializers={
+            "text/plain": stream_search_responsify(LineSerializer(), "text/plain"),
+            "text/csv": "unknown_module:csv_serializer",
+        },
+        search_serializers_aliases={"csv": "text/csv"},
+    )
+    client = app.test_client()
+    # the unknown serializer module is never imported
+    assert client.get("/export/records/", buffered=True).status_code == 200
+    res = client.get("/export/records/", headers={"Accept": "text/plain"}, buffered=True)
+    assert res.get_data(as_text=True) == "0,1,2,3,4,5,6,7,8,9\n"
+
+    view = app.view_functions["api_exports.records_export"]
+    assert list(view.view_kwargs["search_serializers"].loaded) == ["text/plain"]
+
+
+def test_export_view_abort(create_app, monkeypatch):
+    """Test export view aborted by the client."""
+    app = create_export_app(create_app, search_batch_size=2)
+    client = app.test_client()
+    with app.app_context():
+        limiter = app.extensions["rero_invenio_base_exports"].limiter
+    res = client.get("/export/records/", buffered=False)
+    next(res.response)
+    res.close()
+    assert limiter.running["api_exports.records_export"] == 0
+    assert limiter.aborted["api_exports.records_export"] == 1
+
+    # errors while releasing the search context do not prevent to release
+    # the export slot
+    def close(self):
+        raise ConnectionError("cluster unreachable")
+
+    monkeypatch.setattr("rero_invenio_base.modules.export.iterators.BatchedHits.close", close)
+    res = client.get("/export/records/", buffered=False)
+    next(res.response)
+    res.close()
+    assert limiter.running["api_exports.records_export"] == 0
+    assert limiter.aborted["api_exports.records_export"] == 2